@@ -1,13 +1,67 @@
 #!/usr/bin/env python3
 """Convert markdown documentation to DOCX format."""
 
+import io
 import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.enum.style import WD_STYLE_TYPE
 
+# Precompiled patterns used by parse_markdown_line
+# Block-level line classifier, matched once against the stripped line.
+# Each alternative is wrapped in a named group so match.lastgroup names the kind.
+_LINE_RE = re.compile(
+    r'(?P<fence>```)'
+    r'|(?P<table>\|)'
+    r'|(?P<heading>(?P<hmarks>#{1,6})\s+(?P<htext>.+))'
+    r'|(?P<hr>(?:---|\*\*\*|___)$)'
+    r'|(?P<bullet>[-*+] )'
+    r'|(?P<numbered>\d+\.\s+(?P<ntext>.+))'
+)
+_RE_TABLE_SEP = re.compile(r'[|\-: ]+')
+_RE_BOLD_STAR = re.compile(r'\*\*(.+?)\*\*')
+_RE_BOLD_UNDER = re.compile(r'__(.+?)__')
+_RE_INLINE_CODE = re.compile(r'`(.+?)`')
+
+# Emoji/status symbols replaced with plain-text markers in one pass
+# ('⚠️' carries a variation selector, so a translate table cannot express it)
+_EMOJI_MAP = {
+    '✅': '[OK]',
+    '⚠️': '[WARN]',
+    '🔴': '[CRITICAL]',
+    '🟡': '[WARN]',
+    '🟢': '[OK]',
+}
+_RE_EMOJI = re.compile('|'.join(map(re.escape, _EMOJI_MAP)))
+
+
+@dataclass(slots=True)
+class ParseState:
+    """Block-level state carried between markdown lines."""
+
+    in_code_block: bool = False
+    code_buf: io.StringIO = field(default_factory=io.StringIO)
+    in_table: bool = False
+    table_lines: list = field(default_factory=list)
+
+    def flush_code_block(self, doc):
+        """Emit buffered code lines (if any) and reset the buffer."""
+        if self.code_buf.tell():
+            # Drop the newline written after the last line
+            add_code_block(doc, self.code_buf.getvalue()[:-1])
+            self.code_buf = io.StringIO()
+
+    def flush_table(self, doc):
+        """Emit buffered table rows (if any) and leave table mode."""
+        if self.table_lines:
+            add_table_from_markdown(doc, self.table_lines)
+            self.table_lines = []
+        self.in_table = False
+
 
 def add_styled_paragraph(doc, text, style='Normal'):
     """Add a paragraph with specific style."""
@@ -39,7 +93,7 @@ def add_table_from_markdown(doc, table_lines):
     # Parse table headers and rows
     rows_data = []
     for line in table_lines:
-        if '|' in line and not all(c in '|-: ' for c in line):
+        if '|' in line and not _RE_TABLE_SEP.fullmatch(line):
             cells = [cell.strip() for cell in line.split('|')[1:-1]]
             if cells:
                 rows_data.append(cells)
@@ -52,104 +106,99 @@ def add_table_from_markdown(doc, table_lines):
     table = doc.add_table(rows=len(rows_data), cols=num_cols)
     table.style = 'Light Grid Accent 1'
 
-    # Populate table
-    for i, row_data in enumerate(rows_data):
-        for j, cell_text in enumerate(row_data):
-            if j < num_cols:
-                cell = table.rows[i].cells[j]
-                cell.text = cell_text
-                # Bold header row
-                if i == 0:
-                    for paragraph in cell.paragraphs:
-                        for run in paragraph.runs:
-                            run.font.bold = True
+    # Populate table (resolve the rows/cells collections once, not per cell)
+    for i, (row, row_data) in enumerate(zip(table.rows, rows_data)):
+        cells = row.cells
+        for cell, cell_text in zip(cells, row_data):
+            cell.text = cell_text
+            # Bold header row (setting cell.text leaves exactly one paragraph/run)
+            if i == 0:
+                paragraph = cell.paragraphs[0]
+                runs = paragraph.runs
+                run = runs[0] if runs else paragraph.add_run()
+                run.font.bold = True
 
     return table
 
 
-def parse_markdown_line(doc, line, in_code_block, code_lines, in_table, table_lines):
+def parse_markdown_line(doc, line, state):
     """Parse a single line of markdown and add to document."""
+    stripped = line.strip()
+    match = _LINE_RE.match(stripped)
+    kind = match.lastgroup if match else None
+
     # Handle code blocks
-    if line.strip().startswith('```'):
-        if in_code_block:
+    if kind == 'fence':
+        if state.in_code_block:
             # End of code block
-            if code_lines:
-                add_code_block(doc, '\n'.join(code_lines))
-                code_lines.clear()
-            return False, code_lines, in_table, table_lines
-        else:
-            # Start of code block
-            return True, code_lines, in_table, table_lines
-
-    if in_code_block:
-        code_lines.append(line.rstrip())
-        return in_code_block, code_lines, in_table, table_lines
+            state.flush_code_block(doc)
+        state.in_code_block = not state.in_code_block
+        return
+
+    if state.in_code_block:
+        state.code_buf.write(line.rstrip())
+        state.code_buf.write('\n')
+        return
 
     # Handle tables
-    if line.strip().startswith('|'):
-        if not in_table:
-            table_lines = [line]
-            return in_code_block, code_lines, True, table_lines
-        else:
-            table_lines.append(line)
-            return in_code_block, code_lines, in_table, table_lines
-    elif in_table:
+    if kind == 'table':
+        state.table_lines.append(line)
+        state.in_table = True
+        return
+    elif state.in_table:
         # End of table
-        if table_lines:
-            add_table_from_markdown(doc, table_lines)
-            table_lines = []
-        in_table = False
-
-    # Handle headings
-    if line.startswith('#'):
-        match = re.match(r'^(#{1,6})\s+(.+)$', line)
-        if match:
-            level = len(match.group(1))
-            text = match.group(2).strip()
-            add_heading_with_formatting(doc, text, level=min(level, 3))
-            return in_code_block, code_lines, in_table, table_lines
+        state.flush_table(doc)
+
+    # Blank lines only terminate blocks; nothing else to emit
+    if not stripped:
+        return
+
+    # Handle headings (only when not indented)
+    if kind == 'heading' and line.startswith('#'):
+        level = len(match.group('hmarks'))
+        text = match.group('htext').strip()
+        add_heading_with_formatting(doc, text, level=min(level, 3))
+        return
 
     # Handle horizontal rules
-    if line.strip() in ['---', '***', '___']:
+    if kind == 'hr':
         doc.add_paragraph('_' * 80)
-        return in_code_block, code_lines, in_table, table_lines
+        return
 
     # Handle bullet lists
-    if line.strip().startswith(('- ', '* ', '+ ')):
-        text = line.strip()[2:]
-        p = doc.add_paragraph(text, style='List Bullet')
-        return in_code_block, code_lines, in_table, table_lines
+    if kind == 'bullet':
+        text = stripped[2:]
+        doc.add_paragraph(text, style='List Bullet')
+        return
 
     # Handle numbered lists
-    if re.match(r'^\d+\.\s+', line.strip()):
-        text = re.sub(r'^\d+\.\s+', '', line.strip())
-        p = doc.add_paragraph(text, style='List Number')
-        return in_code_block, code_lines, in_table, table_lines
+    if kind == 'numbered':
+        text = match.group('ntext')
+        doc.add_paragraph(text, style='List Number')
+        return
 
     # Handle checkboxes
     if '- [x]' in line or '- [ ]' in line:
         text = line.replace('- [x]', '☑').replace('- [ ]', '☐').strip()
-        p = doc.add_paragraph(text, style='List Bullet')
-        return in_code_block, code_lines, in_table, table_lines
+        doc.add_paragraph(text, style='List Bullet')
+        return
 
     # Handle bold, italic, inline code
-    if line.strip():
-        # Process markdown formatting
-        text = line
-        # Remove excessive bold markers
-        text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-        text = re.sub(r'__(.+?)__', r'\1', text)
-        # Remove inline code markers
-        text = re.sub(r'`(.+?)`', r'\1', text)
-        # Clean up emoji/special characters
-        text = text.replace('✅', '[OK]').replace('⚠️', '[WARN]').replace('🔴', '[CRITICAL]')
-        text = text.replace('🟡', '[WARN]').replace('🟢', '[OK]')
-
-        if text.strip():
-            p = doc.add_paragraph(text.strip())
-            return in_code_block, code_lines, in_table, table_lines
-
-    return in_code_block, code_lines, in_table, table_lines
+    text = line
+    # Remove excessive bold markers (skip the regex when the marker is absent)
+    if '**' in text:
+        text = _RE_BOLD_STAR.sub(r'\1', text)
+    if '__' in text:
+        text = _RE_BOLD_UNDER.sub(r'\1', text)
+    # Remove inline code markers
+    if '`' in text:
+        text = _RE_INLINE_CODE.sub(r'\1', text)
+    # Clean up emoji/special characters
+    text = _RE_EMOJI.sub(lambda m: _EMOJI_MAP[m.group()], text)
+
+    text = text.strip()
+    if text:
+        doc.add_paragraph(text)
 
 
 def convert_markdown_to_docx(markdown_file, docx_file):
@@ -167,53 +216,50 @@ def convert_markdown_to_docx(markdown_file, docx_file):
         section.left_margin = Inches(1)
         section.right_margin = Inches(1)
 
-    # Read markdown file
-    with open(markdown_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    # Parse markdown
-    in_code_block = False
-    code_lines = []
-    in_table = False
-    table_lines = []
+    # Parse markdown, streaming the file line by line
+    state = ParseState()
 
-    for line in lines:
-        in_code_block, code_lines, in_table, table_lines = parse_markdown_line(
-            doc, line.rstrip(), in_code_block, code_lines, in_table, table_lines
-        )
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            parse_markdown_line(doc, line.rstrip(), state)
 
     # Handle any remaining code block
-    if code_lines:
-        add_code_block(doc, '\n'.join(code_lines))
+    state.flush_code_block(doc)
 
     # Handle any remaining table
-    if table_lines:
-        add_table_from_markdown(doc, table_lines)
+    state.flush_table(doc)
 
     # Save document
     doc.save(docx_file)
     print(f"✓ Saved to {docx_file}")
 
 
+def convert_if_exists(markdown_file, docx_file):
+    """Convert markdown file to DOCX, warning if the source is missing."""
+    if markdown_file.exists():
+        convert_markdown_to_docx(markdown_file, docx_file)
+    else:
+        print(f"Warning: {markdown_file} not found")
+
+
 def main():
     """Main conversion function."""
     base_dir = Path(__file__).parent
 
-    # Convert Production Readiness document
+    # Production Readiness document
     production_md = base_dir / "PRODUCTION_READINESS.md"
     production_docx = base_dir / "PRODUCTION_READINESS.docx"
-    if production_md.exists():
-        convert_markdown_to_docx(production_md, production_docx)
-    else:
-        print(f"Warning: {production_md} not found")
 
-    # Convert Codebase Documentation
+    # Codebase Documentation
     codebase_md = base_dir / "CODEBASE_DOCUMENTATION.md"
     codebase_docx = base_dir / "CODEBASE_DOCUMENTATION.docx"
-    if codebase_md.exists():
-        convert_markdown_to_docx(codebase_md, codebase_docx)
-    else:
-        print(f"Warning: {codebase_md} not found")
+
+    # Conversions are independent and CPU-bound, so run them in separate processes
+    jobs = [(production_md, production_docx), (codebase_md, codebase_docx)]
+    with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = [executor.submit(convert_if_exists, md, docx) for md, docx in jobs]
+        for future in futures:
+            future.result()
 
     print("\n✓ Conversion complete!")
     print(f"  - {production_docx}")
@@ -30,9 +30,18 @@ setup(
         "reportlab>=4.0.0",
     ],
     extras_require={
+        "fast": [
+            "orjson>=3.8.0",
+            "pyyaml>=6.0",
+            "pyahocorasick>=2.0.0",
+            "jsonschema-rs>=0.20.0",
+            "fastjsonschema>=2.16.0",
+            "blake3>=0.3.0",
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-cov>=4.1.0",
+            "pytest-xdist>=3.0.0",
             "pytest-asyncio>=0.21.0",
             "black>=23.0.0",
             "flake8>=6.0.0",
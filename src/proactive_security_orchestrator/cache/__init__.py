@@ -0,0 +1 @@
+"""Scan result caching."""
@@ -0,0 +1,163 @@
+"""Content-addressed cache of per-file scan findings."""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# BLAKE3 hashes with SIMD; hashlib's SHA-256 uses SHA-NI where available
+_FILE_DIGEST = blake3.blake3 if BLAKE3_AVAILABLE else "sha256"
+
+# Hashing releases the GIL, so threads hash files in parallel
+_HASH_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Fewer files than this are hashed on the calling thread
+_PARALLEL_HASH_THRESHOLD = 64
+
+# Findings depend on the path as well as the content (the language comes from
+# the extension, rule path filters match on it), so both are part of the key
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_findings (
+    path TEXT NOT NULL,
+    file_hash TEXT NOT NULL,
+    rules_hash TEXT NOT NULL,
+    findings_json BLOB NOT NULL,
+    PRIMARY KEY (path, file_hash, rules_hash)
+)
+"""
+
+# Stay well below SQLite's bound-parameter limit (two per key) in IN (...) lookups
+_LOOKUP_BATCH_SIZE = 400
+
+
+def hash_file(path: Path | str) -> str:
+    """Hash a file's contents.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex-encoded BLAKE3 digest, or SHA-256 if blake3 is not installed
+    """
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, _FILE_DIGEST).hexdigest()
+
+
+def _try_hash_file(path: Path) -> str | None:
+    """Hash a file's contents, ignoring unreadable files.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex-encoded digest, or None if the file cannot be read
+    """
+    try:
+        return hash_file(path)
+    except OSError:
+        return None
+
+
+def hash_files(paths: Iterable[Path]) -> Dict[Path, str]:
+    """Hash many files, in parallel for large file sets.
+
+    Args:
+        paths: Files to hash
+
+    Returns:
+        Digest per readable file, in input order; unreadable files are omitted
+    """
+    paths = list(paths)
+    if len(paths) < _PARALLEL_HASH_THRESHOLD:
+        digests = list(map(_try_hash_file, paths))
+    else:
+        with ThreadPoolExecutor(max_workers=_HASH_MAX_WORKERS) as executor:
+            digests = list(executor.map(_try_hash_file, paths))
+    return {path: digest for path, digest in zip(paths, digests) if digest is not None}
+
+
+class FindingsCache:
+    """SQLite store of findings keyed by (file path, file content hash, rules hash).
+
+    A file whose path, content and rule set are unchanged since a previous
+    scan can reuse that scan's findings instead of being analyzed again.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """Open (creating if needed) the cache database.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        # WAL lets concurrent scans read while another one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+
+    def get_many(
+        self, keys: Iterable[Tuple[str, str]], rules_hash: str
+    ) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+        """Look up cached findings for many files at once.
+
+        Args:
+            keys: (path, content hash) of the files to look up
+            rules_hash: Hash of the rule set the findings were produced with
+
+        Returns:
+            Mapping of (path, content hash) to cached findings, for cache hits only
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        hits: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for start in range(0, len(unique_keys), _LOOKUP_BATCH_SIZE):
+            batch = unique_keys[start:start + _LOOKUP_BATCH_SIZE]
+            placeholders = ",".join(["(?, ?)"] * len(batch))
+            rows = self._conn.execute(
+                f"SELECT path, file_hash, findings_json FROM file_findings "
+                f"WHERE rules_hash = ? AND (path, file_hash) IN (VALUES {placeholders})",
+                [rules_hash, *chain.from_iterable(batch)],
+            )
+            for path, file_hash, findings_json in rows:
+                hits[(path, file_hash)] = json.loads(findings_json)
+        return hits
+
+    def put_many(self, entries: Iterable[Tuple[str, str, List[Dict[str, Any]]]], rules_hash: str) -> None:
+        """Store findings for many files in one transaction.
+
+        Args:
+            entries: Triples of (path, content hash, findings for that file)
+            rules_hash: Hash of the rule set the findings were produced with
+        """
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO file_findings (path, file_hash, rules_hash, findings_json) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    (path, file_hash, rules_hash, json.dumps(findings).encode("utf-8"))
+                    for path, file_hash, findings in entries
+                ),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "FindingsCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -2,28 +2,33 @@
 
 import logging
 import sys
+from collections import Counter
 from pathlib import Path
 
 import typer
 from rich.console import Console
-from rich.logging import RichHandler
-
-from proactive_security_orchestrator.formatters.output_formatter import OutputFormatter
-from proactive_security_orchestrator.security_orchestrator import SecurityScanner
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    datefmt="[%X]",
-    handlers=[RichHandler(rich_tracebacks=True)],
-)
 
 logger = logging.getLogger(__name__)
 console = Console()
 app = typer.Typer(help="Proactive Security Orchestrator - Unified security scanning")
 
 
+def _configure_logging() -> None:
+    """Configure Rich logging on first use.
+
+    Deferred until a scan starts so that `--help` and `version` do not pay
+    for the handler setup.
+    """
+    from rich.logging import RichHandler
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(message)s",
+        datefmt="[%X]",
+        handlers=[RichHandler(rich_tracebacks=True)],
+    )
+
+
 @app.command()
 def scan(
     repo_path: str = typer.Argument(..., help="Path to repository to scan"),
@@ -33,6 +38,7 @@ def scan(
     timeout: int = typer.Option(60, "--timeout", "-t", help="Timeout in seconds for each tool"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
     fail_on_critical: bool = typer.Option(True, "--fail-on-critical/--no-fail-on-critical", help="Exit with code 1 if critical findings are detected (default: True)"),
+    base_ref: str | None = typer.Option(None, "--base-ref", help="Only scan changes since this git ref (e.g. origin/main)"),
 ):
     """Scan repository for security vulnerabilities and secrets.
 
@@ -41,7 +47,54 @@ def scan(
         $ security-scan /path/to/repo --format sarif --output findings.sarif
         $ security-scan /path/to/repo --format html --output dashboard.html
         $ security-scan /path/to/repo --format pdf --output report.pdf
+        $ security-scan /path/to/repo --base-ref origin/main
     """
+    sys.exit(
+        scan_command(
+            repo_path,
+            format=format,
+            output=output,
+            config_dir=config_dir,
+            timeout=timeout,
+            verbose=verbose,
+            fail_on_critical=fail_on_critical,
+            base_ref=base_ref,
+        )
+    )
+
+
+def scan_command(
+    repo_path: str | Path,
+    format: str = "json",
+    output: Path | str | None = None,
+    config_dir: Path | str = "config",
+    timeout: int = 60,
+    verbose: bool = False,
+    fail_on_critical: bool = True,
+    base_ref: str | None = None,
+) -> int:
+    """Run a scan and write its report; the body of the `scan` command.
+
+    Callable without Typer/Click (e.g. from tests or other Python code).
+
+    Args:
+        repo_path: Path to repository to scan
+        format: Output format: json, sarif, html, pdf
+        output: Output file path (default: stdout for json, file for other formats)
+        config_dir: Configuration directory
+        timeout: Timeout in seconds for each tool
+        verbose: Enable verbose logging
+        fail_on_critical: Return 1 if critical findings are detected
+        base_ref: Only scan changes since this git ref
+
+    Returns:
+        Process exit code
+    """
+    # Heavy imports are deferred so `--help` and `version` stay fast
+    from proactive_security_orchestrator.formatters.output_formatter import OutputFormatter
+    from proactive_security_orchestrator.security_orchestrator import SecurityScanner
+
+    _configure_logging()
     if verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
@@ -49,13 +102,13 @@ def scan(
     valid_formats = ["json", "sarif", "html", "pdf"]
     if format.lower() not in valid_formats:
         console.print(f"[red]Error: Invalid format '{format}'. Must be one of: {', '.join(valid_formats)}[/red]")
-        sys.exit(1)
+        return 1
 
     # Validate repo path
     repo_path_obj = Path(repo_path)
     if not repo_path_obj.exists():
         console.print(f"[red]Error: Repository path does not exist: {repo_path}[/red]")
-        sys.exit(1)
+        return 1
 
     try:
         # Initialize scanner
@@ -64,24 +117,20 @@ def scan(
 
         # Run scan
         console.print(f"[blue]Scanning repository: {repo_path}[/blue]")
-        findings = scanner.scan(repo_path_obj)
+        findings = scanner.scan(repo_path_obj, base_ref=base_ref)
+
+        # Count by severity
+        severity_counts = Counter(finding.get("severity", "info") for finding in findings)
 
         if not findings:
             console.print("[green]✓ No security findings detected![/green]")
         else:
             console.print(f"[yellow]Found {len(findings)} security findings[/yellow]")
-
-            # Count by severity
-            severity_counts = {}
-            for finding in findings:
-                severity = finding.get("severity", "info")
-                severity_counts[severity] = severity_counts.get(severity, 0) + 1
-
-            console.print(f"  Critical: {severity_counts.get('critical', 0)}")
-            console.print(f"  High: {severity_counts.get('high', 0)}")
-            console.print(f"  Medium: {severity_counts.get('medium', 0)}")
-            console.print(f"  Low: {severity_counts.get('low', 0)}")
-            console.print(f"  Info: {severity_counts.get('info', 0)}")
+            console.print(f"  Critical: {severity_counts['critical']}")
+            console.print(f"  High: {severity_counts['high']}")
+            console.print(f"  Medium: {severity_counts['medium']}")
+            console.print(f"  Low: {severity_counts['low']}")
+            console.print(f"  Info: {severity_counts['info']}")
 
         # Format and save output
         formatter = OutputFormatter()
@@ -104,25 +153,20 @@ def scan(
                 console.print(f"[green]✓ Output saved to {default_output}[/green]")
 
         # Exit with non-zero if critical findings (unless --no-fail-on-critical is set)
-        if any(f.get("severity") == "critical" for f in findings):
+        if severity_counts["critical"]:
             console.print("[red]⚠ Critical findings detected![/red]")
             if fail_on_critical:
-                sys.exit(1)
-            else:
-                console.print("[yellow]Continuing with exit code 0 (--no-fail-on-critical enabled)[/yellow]")
-                sys.exit(0)
-        elif findings:
-            sys.exit(0)
-        else:
-            sys.exit(0)
+                return 1
+            console.print("[yellow]Continuing with exit code 0 (--no-fail-on-critical enabled)[/yellow]")
+        return 0
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Scan interrupted by user[/yellow]")
-        sys.exit(130)
+        return 130
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         logger.exception("Scan failed")
-        sys.exit(1)
+        return 1
 
 
 @app.command()
@@ -1,9 +1,14 @@
 """Output formatters for security findings."""
 
+import functools
 import json
+import re
+from collections import Counter
 from datetime import datetime
+from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List
+from string import Formatter
+from typing import Any, Dict, Iterable, Iterator, List
 
 try:
     from reportlab.lib import colors
@@ -16,8 +21,194 @@ try:
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
+try:
+    import orjson
+    # Non-string keys are stringified, matching the stdlib json fallback
+    _ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from proactive_security_orchestrator import __version__
 
+
+def _dumps_bytes(obj: Any) -> bytes:
+    """Serialize to pretty-printed UTF-8 JSON, using orjson when available.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        UTF-8 encoded JSON indented by two spaces
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to pretty-printed JSON, using orjson when available.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        JSON string indented by two spaces
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+# Map severity levels to SARIF result levels
+_SARIF_LEVELS = {
+    "critical": "error",
+    "high": "error",
+    "medium": "warning",
+    "low": "note",
+    "info": "note",
+}
+
+
+def _finding_severities(findings: List[Dict[str, Any]]) -> List[str]:
+    """Normalize the severity of each finding to lower case.
+
+    Args:
+        findings: List of finding dictionaries
+
+    Returns:
+        Lower-case severity per finding; missing or empty severities become "info"
+    """
+    return [(finding.get("severity") or "info").lower() for finding in findings]
+
+
+def _count_severities(severities: List[str]) -> Counter:
+    """Count findings per severity level.
+
+    Unrecognized levels are counted as "info", so the per-level counts add up
+    to the total.
+
+    Args:
+        severities: Lower-case severity per finding
+
+    Returns:
+        Counter keyed by severity level (missing levels read as 0)
+    """
+    counts = Counter(severities)
+    # Folding per distinct key is cheaper than checking every finding
+    for severity in counts.keys() - _SARIF_LEVELS.keys():
+        counts["info"] += counts.pop(severity)
+    return counts
+
+
+# Evidence line ranges: "L100" or "L100-L145" (the "L" prefix is optional)
+_LINES_RE = re.compile(r"L?(\d+)(?:-L?(\d+))?")
+
+# Same replacements as html.escape(), applied in a single str.translate pass
+_HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+
+def _escape_html(value: Any) -> str:
+    """Escape a value for safe interpolation into HTML.
+
+    Args:
+        value: Value to escape (converted to str first)
+
+    Returns:
+        HTML-escaped string
+    """
+    return str(value).translate(_HTML_ESCAPE_TABLE)
+
+
+# Characters that ReportLab's paragraph markup parser treats specially
+_PDF_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+})
+
+
+def _escape_pdf(value: Any) -> str:
+    """Escape a value for safe interpolation into ReportLab paragraph markup.
+
+    Args:
+        value: Value to escape (converted to str first)
+
+    Returns:
+        Escaped string
+    """
+    return str(value).translate(_PDF_ESCAPE_TABLE)
+
+
+@functools.lru_cache(maxsize=32)
+def _severity_html_attrs(severity: str) -> tuple[str, str, str]:
+    """Build the finding class, badge class and label for a severity.
+
+    Memoized, so each distinct severity is formatted and escaped only once.
+
+    Args:
+        severity: Lower-case severity name
+
+    Returns:
+        Tuple of (finding class attribute, badge class attribute, badge label)
+    """
+    escaped = _escape_html(severity)
+    return (
+        f"finding severity-{escaped}",
+        f"badge badge-{escaped}",
+        _escape_html(severity.upper()),
+    )
+
+
+# Buffer size for files streamed by save_to_file
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _ensure_parent_dir(output_path: Path) -> None:
+    """Create the parent directory of an output file if it is missing.
+
+    Not cached, so a directory removed after an earlier save is recreated.
+
+    Args:
+        output_path: Path to output file
+    """
+    parent = output_path.parent
+    if str(parent) in ("", "."):
+        return
+    parent.mkdir(parents=True, exist_ok=True)
+
+
+def _write_json_array(items: List[Any], output_path: Path) -> None:
+    """Stream a list to a JSON file one element at a time.
+
+    Produces the same UTF-8 bytes as _dumps_bytes(items) without holding
+    the whole document in memory.
+
+    Args:
+        items: List of JSON-serializable objects
+        output_path: Path to output file
+    """
+    with output_path.open("wb", buffering=_WRITE_BUFFER_SIZE) as f:
+        if not items:
+            f.write(b"[]")
+            return
+
+        f.write(b"[\n")
+        for index, item in enumerate(items):
+            if index:
+                f.write(b",\n")
+            # Re-indent the element one level; JSON strings never contain raw newlines
+            f.write(b"  ")
+            f.write(_dumps_bytes(item).replace(b"\n", b"\n  "))
+        f.write(b"\n]")
+
+
 # Template for HTML dashboard
 HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
@@ -86,6 +277,218 @@ HTML_TEMPLATE = """<!DOCTYPE html>
 </body>
 </html>
 """
+# Per-finding fragments of the HTML dashboard
+_FINDING_HTML_TEMPLATE = """
+            <div class="{finding_class}">
+                <div class="finding-header">
+                    <div class="finding-title">{finding_text}</div>
+                    <div>
+                        <span class="{badge_class}">{severity_label}</span>
+                        <span class="badge">{tool}</span>
+                    </div>
+                </div>
+                <div class="meta">Rule ID: {rule_id}</div>
+                {evidence_html}
+                {remediation_html}
+            </div>
+            """
+
+_EVIDENCE_HTML_TEMPLATE = """
+                <div class="evidence">
+                    <div><strong>{path}</strong> <span style="color: #666;">({lines})</span></div>
+                    <div style="margin-top: 5px; color: #666;">{why}</div>
+                    {code_html}
+                </div>
+                """
+
+_CODE_HTML_TEMPLATE = '<div class="code">{code}</div>'
+
+_REMEDIATION_HTML_TEMPLATE = '<div class="meta"><strong>Remediation:</strong> {remediation}</div>'
+
+
+# HTML_TEMPLATE pre-split into (literal, field_name) segments so rendering is a
+# plain join instead of re-parsing the placeholders on every call
+_HTML_TEMPLATE_SEGMENTS = tuple(
+    (literal, field_name) for literal, field_name, _, _ in Formatter().parse(HTML_TEMPLATE)
+)
+
+
+def _iter_html_template(findings_html: Iterable[str], **values: Any) -> Iterator[str]:
+    """Fill HTML_TEMPLATE from its pre-split segments.
+
+    Args:
+        findings_html: Chunks making up the findings section
+        **values: Value for each remaining template placeholder
+
+    Yields:
+        Consecutive chunks of the rendered HTML
+    """
+    for literal, field_name in _HTML_TEMPLATE_SEGMENTS:
+        yield literal
+        if field_name == "findings_html":
+            yield from findings_html
+        elif field_name is not None:
+            yield str(values[field_name])
+
+
+@functools.cache
+def _pdf_styles() -> Dict[str, Any]:
+    """Build the reportlab styles used by to_pdf.
+
+    Cached so the styles and their HexColor values are constructed once per
+    process instead of per report (and per finding/evidence).
+
+    Returns:
+        Dictionary of paragraph styles and the summary table style
+    """
+    styles = getSampleStyleSheet()
+    normal = styles['Normal']
+
+    return {
+        "normal": normal,
+        "title": ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#1a1a1a'),
+            spaceAfter=30,
+            alignment=1,  # Center
+        ),
+        "heading": ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=12,
+            spaceBefore=20,
+        ),
+        "code": ParagraphStyle(
+            'Code',
+            parent=normal,
+            fontName='Courier',
+            fontSize=8,
+            leftIndent=20,
+            backColor=colors.HexColor('#f5f5f5'),
+            borderPadding=5,
+        ),
+        "remediation": ParagraphStyle(
+            'Remediation',
+            parent=normal,
+            leftIndent=20,
+            backColor=colors.HexColor('#e8f5e9'),
+            borderPadding=8,
+            borderColor=colors.HexColor('#4caf50'),
+            borderWidth=1,
+        ),
+        "footer": ParagraphStyle(
+            'Footer',
+            parent=normal,
+            fontSize=8,
+            textColor=colors.grey,
+            alignment=1,  # Center
+        ),
+        # setStyle() copies the commands, so one TableStyle serves every report
+        "summary_table": TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]),
+    }
+
+
+def _pdf_findings_story(
+    findings: List[Dict[str, Any]],
+    severities: List[str],
+    start: int,
+    total: int,
+) -> List[Any]:
+    """Build the PDF flowables for a run of consecutive findings.
+
+    Args:
+        findings: Findings to render
+        severities: Lower-case severity of each finding
+        start: 1-based report position of the first finding
+        total: Total number of findings in the report
+
+    Returns:
+        List of flowables, in finding order
+    """
+    pdf_styles = _pdf_styles()
+    normal_style = pdf_styles["normal"]
+    heading_style = pdf_styles["heading"]
+    code_style = pdf_styles["code"]
+    remediation_style = pdf_styles["remediation"]
+
+    story: List[Any] = []
+    append = story.append
+    extend = story.extend
+
+    # A page break carries no per-use state, so one instance is shared
+    page_break = PageBreak()
+    escape = _escape_pdf
+    for idx, (severity, finding) in enumerate(zip(severities, findings), start):
+        # Finding fields are interpolated into paragraph markup, so
+        # they are escaped like the code snippets
+        finding_text = escape(finding.get("finding", "Unknown issue"))
+        rule_id = escape(finding.get("rule_id", "unknown"))
+        tool = escape(finding.get("tool", "unknown"))
+        remediation = escape(finding.get("remediation", ""))
+
+        # Finding header
+        extend([Paragraph(f"<b>{idx}. {finding_text}</b>", heading_style), Spacer(1, 0.05*inch)])
+
+        # Metadata bullet points, laid out as a single paragraph
+        metadata_html = (
+            f"• <b>Severity:</b> {escape(severity.upper())}<br/>"
+            f"• <b>Tool:</b> {tool}<br/>"
+            f"• <b>Rule ID:</b> {rule_id}"
+        )
+        extend([Paragraph(metadata_html, normal_style), Spacer(1, 0.1*inch)])
+
+        # Evidence section
+        evidence_list = finding.get("evidence", [])
+        if evidence_list:
+            extend([Paragraph("<b>Locations:</b>", normal_style), Spacer(1, 0.05*inch)])
+
+            for evidence in evidence_list:
+                path = escape(evidence.get("path", ""))
+                lines = escape(evidence.get("lines", ""))
+                why = escape(evidence.get("why_relevant", ""))
+                code = escape(evidence.get("code_snippet", ""))
+
+                location_text = f"• <b>File:</b> {path} <b>({lines})</b>"
+                extend([Paragraph(location_text, normal_style), Spacer(1, 0.02*inch)])
+
+                if why:
+                    extend([Paragraph(f"  <i>Reason:</i> {why}", normal_style), Spacer(1, 0.02*inch)])
+
+                if code:
+                    # Code snippet in monospace
+                    extend([
+                        Paragraph(f"<font face='Courier'>{code}</font>", code_style),
+                        Spacer(1, 0.05*inch),
+                    ])
+
+        # Remediation section
+        if remediation:
+            extend([
+                Spacer(1, 0.1*inch),
+                Paragraph(f"<b>Remediation:</b> {remediation}", remediation_style),
+            ])
+
+        append(Spacer(1, 0.2*inch))
+
+        # Add page break if not last finding
+        if idx < total:
+            append(page_break)
+
+    return story
 
 
 class OutputFormatter:
@@ -101,7 +504,7 @@ class OutputFormatter:
         Returns:
             Pretty-printed JSON string
         """
-        return json.dumps(findings, indent=2, ensure_ascii=False)
+        return _dumps(findings)
 
     @staticmethod
     def to_sarif(findings: List[Dict[str, Any]]) -> str:
@@ -113,6 +516,18 @@ class OutputFormatter:
         Returns:
             SARIF JSON string
         """
+        return _dumps(OutputFormatter._build_sarif(findings))
+
+    @staticmethod
+    def _build_sarif(findings: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the SARIF 2.1.0 log object for findings.
+
+        Args:
+            findings: List of finding dictionaries
+
+        Returns:
+            SARIF log as a dictionary
+        """
         # SARIF structure
         sarif = {
             "version": "2.1.0",
@@ -132,23 +547,18 @@ class OutputFormatter:
             ],
         }
 
-        # Map severity levels
-        severity_map = {
-            "critical": "error",
-            "high": "error",
-            "medium": "warning",
-            "low": "note",
-            "info": "note",
-        }
-
         # Collect unique rules
         rules_dict: Dict[str, Dict[str, Any]] = {}
-        results = []
+        results: List[Dict[str, Any]] = []
+        append_result = results.append
 
         for finding in findings:
+            # Read each finding field once
             rule_id = finding.get("rule_id", "unknown")
             severity = finding.get("severity", "medium").lower()
-            sarif_severity = severity_map.get(severity, "warning")
+            sarif_severity = _SARIF_LEVELS.get(severity, "warning")
+            tool = finding.get("tool", "unknown")
+            confidence = finding.get("confidence", 0.5)
             
             # Get human-readable finding message
             finding_message = finding.get("finding", "")
@@ -186,13 +596,18 @@ class OutputFormatter:
                         "markdown": remediation
                     },
                     "properties": {
-                        "tags": [finding.get("tool", "unknown"), severity],
-                        "precision": "high" if finding.get("confidence", 0.5) > 0.7 else "medium",
+                        "tags": [tool, severity],
+                        "precision": "high" if confidence > 0.7 else "medium",
                     },
                 }
 
-            # Create result entry for each evidence
-            evidence_list = finding.get("evidence", [])
+            # Create result entry for each evidence; per-finding parts are built
+            # once and shared by all of its results (the log is only serialized)
+            result_properties = {
+                "tool": tool,
+                "confidence": confidence,
+            }
+            evidence_list = finding.get("evidence", ())
             for evidence in evidence_list:
                 path = evidence.get("path", "")
                 lines_str = evidence.get("lines", "")
@@ -203,14 +618,12 @@ class OutputFormatter:
                 line_num = 0
                 end_line_num = None
                 if lines_str:
-                    try:
-                        # Handle "L100" or "L100-L145" format
-                        line_parts = lines_str.replace("L", "").split("-")
-                        line_num = int(line_parts[0])
-                        if len(line_parts) > 1:
-                            end_line_num = int(line_parts[1].replace("L", ""))
-                    except (ValueError, AttributeError):
-                        pass
+                    # Handle "L100" or "L100-L145" format
+                    lines_match = _LINES_RE.fullmatch(str(lines_str).strip())
+                    if lines_match:
+                        line_num = int(lines_match.group(1))
+                        if lines_match.group(2):
+                            end_line_num = int(lines_match.group(2))
 
                 # Build message with context
                 message_text = finding_message
@@ -245,18 +658,15 @@ class OutputFormatter:
                             },
                         }
                     ],
-                    "properties": {
-                        "tool": finding.get("tool", "unknown"),
-                        "confidence": finding.get("confidence", 0.5),
-                    },
+                    "properties": result_properties,
                 }
 
-                results.append(result)
+                append_result(result)
 
         sarif["runs"][0]["tool"]["driver"]["rules"] = list(rules_dict.values())
         sarif["runs"][0]["results"] = results
 
-        return json.dumps(sarif, indent=2, ensure_ascii=False)
+        return sarif
 
     @staticmethod
     def to_html(findings: List[Dict[str, Any]]) -> str:
@@ -268,79 +678,106 @@ class OutputFormatter:
         Returns:
             HTML string
         """
-        # Count findings by severity
-        counts = {"critical": 0, "high": 0, "medium": 0, "low": 0, "info": 0}
-        for finding in findings:
-            severity = finding.get("severity", "info").lower()
-            counts[severity] = counts.get(severity, 0) + 1
-
-        total = len(findings)
+        return "".join(OutputFormatter._iter_html(findings))
 
-        # Generate HTML for each finding
-        findings_html = ""
-        for finding in findings:
-            severity = finding.get("severity", "info").lower()
-            rule_id = finding.get("rule_id", "unknown")
-            tool = finding.get("tool", "unknown")
-            finding_text = finding.get("finding", "")
-
-            # Evidence HTML
-            evidence_html = ""
-            evidence_list = finding.get("evidence", [])
-            for evidence in evidence_list:
-                path = evidence.get("path", "")
-                lines = evidence.get("lines", "")
-                why = evidence.get("why_relevant", "")
-                code = evidence.get("code_snippet", "")
+    @staticmethod
+    def to_html_bytes(findings: List[Dict[str, Any]]) -> bytes:
+        """Generate the HTML dashboard as UTF-8 bytes.
 
-                evidence_html += f"""
-                <div class="evidence">
-                    <div><strong>{path}</strong> <span style="color: #666;">({lines})</span></div>
-                    <div style="margin-top: 5px; color: #666;">{why}</div>
-                    {f'<div class="code">{code}</div>' if code else ''}
-                </div>
-                """
+        Args:
+            findings: List of finding dictionaries
 
-            # Remediation
-            remediation = finding.get("remediation", "")
-            remediation_html = f'<div class="meta"><strong>Remediation:</strong> {remediation}</div>' if remediation else ""
+        Returns:
+            UTF-8 encoded HTML document
+        """
+        return OutputFormatter.to_html(findings).encode("utf-8")
 
-            finding_html = f"""
-            <div class="finding severity-{severity}">
-                <div class="finding-header">
-                    <div class="finding-title">{finding_text}</div>
-                    <div>
-                        <span class="badge badge-{severity}">{severity.upper()}</span>
-                        <span class="badge">{tool}</span>
-                    </div>
-                </div>
-                <div class="meta">Rule ID: {rule_id}</div>
-                {evidence_html}
-                {remediation_html}
-            </div>
-            """
+    @staticmethod
+    def _iter_html(findings: List[Dict[str, Any]]) -> Iterator[str]:
+        """Generate the HTML dashboard as a stream of string chunks.
 
-            findings_html += finding_html
+        Args:
+            findings: List of finding dictionaries
 
-        # If no findings
-        if not findings_html:
-            findings_html = '<div class="finding"><div>No security findings detected.</div></div>'
+        Yields:
+            Consecutive chunks of the HTML document
+        """
+        # Normalize severities once; reused for counting and rendering
+        severities = _finding_severities(findings)
+        counts = _count_severities(severities)
 
         # Format timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = datetime.now().isoformat(sep=" ", timespec="seconds")
+
+        # Generate HTML for each finding lazily, or a placeholder if there are none
+        findings_html: Iterable[str]
+        if findings:
+            findings_html = OutputFormatter._iter_findings_html(findings, severities)
+        else:
+            findings_html = ('<div class="finding"><div>No security findings detected.</div></div>',)
 
         # Fill template
-        html = HTML_TEMPLATE.format(
+        yield from _iter_html_template(
+            findings_html,
             timestamp=timestamp,
-            total=total,
+            total=len(findings),
             critical=counts["critical"],
             high=counts["high"],
             medium=counts["medium"],
             low=counts["low"],
-            findings_html=findings_html,
         )
 
-        return html
+    @staticmethod
+    def _iter_findings_html(
+        findings: List[Dict[str, Any]], severities: List[str]
+    ) -> Iterator[str]:
+        """Render one HTML fragment per finding.
+
+        Args:
+            findings: List of finding dictionaries
+            severities: Lower-cased severity of each finding
+
+        Yields:
+            HTML fragment for each finding
+        """
+        # Local aliases avoid repeated global/attribute lookups in the loop
+        escape = _escape_html
+        severity_attrs = _severity_html_attrs
+        for severity, finding in zip(severities, findings):
+            # Finding fields are untrusted tool output, so escape them before interpolation
+            finding_class, badge_class, severity_label = severity_attrs(severity)
+            rule_id = escape(finding.get("rule_id", "unknown"))
+            tool = escape(finding.get("tool", "unknown"))
+            finding_text = escape(finding.get("finding", ""))
+
+            # Evidence HTML
+            evidence_parts: List[str] = []
+            evidence_list = finding.get("evidence", ())
+            for evidence in evidence_list:
+                code = escape(evidence.get("code_snippet", ""))
+                evidence_parts.append(_EVIDENCE_HTML_TEMPLATE.format(
+                    path=escape(evidence.get("path", "")),
+                    lines=escape(evidence.get("lines", "")),
+                    why=escape(evidence.get("why_relevant", "")),
+                    code_html=_CODE_HTML_TEMPLATE.format(code=code) if code else "",
+                ))
+
+            # Remediation
+            remediation = escape(finding.get("remediation", ""))
+            remediation_html = (
+                _REMEDIATION_HTML_TEMPLATE.format(remediation=remediation) if remediation else ""
+            )
+
+            yield _FINDING_HTML_TEMPLATE.format(
+                finding_class=finding_class,
+                finding_text=finding_text,
+                badge_class=badge_class,
+                severity_label=severity_label,
+                tool=tool,
+                rule_id=rule_id,
+                evidence_html="".join(evidence_parts),
+                remediation_html=remediation_html,
+            )
 
     @staticmethod
     def to_pdf(findings: List[Dict[str, Any]]) -> bytes:
@@ -360,50 +797,27 @@ class OutputFormatter:
                 "reportlab is required for PDF output. Install with: pip install reportlab"
             )
 
-        from io import BytesIO
-
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
         story = []
-        styles = getSampleStyleSheet()
-
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=30,
-            alignment=1,  # Center
-        )
 
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=12,
-            spaceBefore=20,
-        )
+        # Styles are built once per process and shared across reports
+        pdf_styles = _pdf_styles()
+        normal_style = pdf_styles["normal"]
+        title_style = pdf_styles["title"]
+        heading_style = pdf_styles["heading"]
+        footer_style = pdf_styles["footer"]
 
-        severity_colors = {
-            "critical": colors.HexColor('#d32f2f'),
-            "high": colors.HexColor('#f57c00'),
-            "medium": colors.HexColor('#fbc02d'),
-            "low": colors.HexColor('#1976d2'),
-            "info": colors.HexColor('#616161'),
-        }
+        append = story.append
+        extend = story.extend
 
         # Title
-        story.append(Paragraph("Security Scan Report", title_style))
-        story.append(Spacer(1, 0.2*inch))
+        extend([Paragraph("Security Scan Report", title_style), Spacer(1, 0.2*inch)])
 
         # Summary section
         total = len(findings)
-        counts = {"critical": 0, "high": 0, "medium": 0, "low": 0, "info": 0}
-        for finding in findings:
-            severity = finding.get("severity", "info").lower()
-            counts[severity] = counts.get(severity, 0) + 1
+        severities = _finding_severities(findings)
+        counts = _count_severities(severities)
 
         summary_data = [
             ["Total Findings", str(total)],
@@ -415,123 +829,29 @@ class OutputFormatter:
         ]
 
         summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        story.append(summary_table)
-        story.append(Spacer(1, 0.3*inch))
-
-        # Findings section
-        story.append(Paragraph("Security Findings", heading_style))
-        story.append(Spacer(1, 0.1*inch))
+        summary_table.setStyle(pdf_styles["summary_table"])
+        extend([
+            summary_table,
+            Spacer(1, 0.3*inch),
+            # Findings section
+            Paragraph("Security Findings", heading_style),
+            Spacer(1, 0.1*inch),
+        ])
 
         if not findings:
-            story.append(Paragraph("✓ No security findings detected.", styles['Normal']))
+            append(Paragraph("✓ No security findings detected.", normal_style))
         else:
-            for idx, finding in enumerate(findings, 1):
-                severity = finding.get("severity", "info").lower()
-                finding_text = finding.get("finding", "Unknown issue")
-                rule_id = finding.get("rule_id", "unknown")
-                tool = finding.get("tool", "unknown")
-                remediation = finding.get("remediation", "")
-
-                # Finding header with severity color
-                severity_color = severity_colors.get(severity, colors.grey)
-                finding_title = f"<b>{idx}. {finding_text}</b>"
-                story.append(Paragraph(finding_title, heading_style))
-                story.append(Spacer(1, 0.05*inch))
-
-                # Metadata bullet points
-                metadata_items = [
-                    f"<b>Severity:</b> {severity.upper()}",
-                    f"<b>Tool:</b> {tool}",
-                    f"<b>Rule ID:</b> {rule_id}",
-                ]
-
-                for item in metadata_items:
-                    story.append(Paragraph(f"• {item}", styles['Normal']))
-                    story.append(Spacer(1, 0.02*inch))
-
-                story.append(Spacer(1, 0.1*inch))
-
-                # Evidence section
-                evidence_list = finding.get("evidence", [])
-                if evidence_list:
-                    story.append(Paragraph("<b>Locations:</b>", styles['Normal']))
-                    story.append(Spacer(1, 0.05*inch))
-
-                    for evidence in evidence_list:
-                        path = evidence.get("path", "")
-                        lines = evidence.get("lines", "")
-                        why = evidence.get("why_relevant", "")
-                        code = evidence.get("code_snippet", "")
-
-                        location_text = f"• <b>File:</b> {path} <b>({lines})</b>"
-                        story.append(Paragraph(location_text, styles['Normal']))
-                        story.append(Spacer(1, 0.02*inch))
-
-                        if why:
-                            story.append(Paragraph(f"  <i>Reason:</i> {why}", styles['Normal']))
-                            story.append(Spacer(1, 0.02*inch))
-
-                        if code:
-                            # Code snippet in monospace
-                            code_style = ParagraphStyle(
-                                'Code',
-                                parent=styles['Normal'],
-                                fontName='Courier',
-                                fontSize=8,
-                                leftIndent=20,
-                                backColor=colors.HexColor('#f5f5f5'),
-                                borderPadding=5,
-                            )
-                            # Escape HTML and format code
-                            code_escaped = code.replace('<', '&lt;').replace('>', '&gt;')
-                            story.append(Paragraph(f"<font face='Courier'>{code_escaped}</font>", code_style))
-                            story.append(Spacer(1, 0.05*inch))
-
-                # Remediation section
-                if remediation:
-                    story.append(Spacer(1, 0.1*inch))
-                    remediation_style = ParagraphStyle(
-                        'Remediation',
-                        parent=styles['Normal'],
-                        leftIndent=20,
-                        backColor=colors.HexColor('#e8f5e9'),
-                        borderPadding=8,
-                        borderColor=colors.HexColor('#4caf50'),
-                        borderWidth=1,
-                    )
-                    story.append(Paragraph(f"<b>Remediation:</b> {remediation}", remediation_style))
-
-                story.append(Spacer(1, 0.2*inch))
-
-                # Add page break if not last finding
-                if idx < len(findings):
-                    story.append(PageBreak())
+            extend(_pdf_findings_story(findings, severities, 1, total))
 
         # Footer with timestamp
-        story.append(Spacer(1, 0.3*inch))
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.grey,
-            alignment=1,  # Center
-        )
-        story.append(Paragraph(
-            f"Generated by Proactive Security Orchestrator v{__version__} on {timestamp}",
-            footer_style
-        ))
+        timestamp = datetime.now().isoformat(sep=" ", timespec="seconds")
+        extend([
+            Spacer(1, 0.3*inch),
+            Paragraph(
+                f"Generated by Proactive Security Orchestrator v{__version__} on {timestamp}",
+                footer_style
+            ),
+        ])
 
         # Build PDF
         doc.build(story)
@@ -549,24 +869,26 @@ class OutputFormatter:
             format: Output format ('json', 'sarif', 'html', 'pdf')
             output_path: Path to output file
         """
-        output_path = Path(output_path)
+        if not isinstance(output_path, Path):
+            output_path = Path(output_path)
 
         formatter = OutputFormatter()
         if format == "json":
-            content = formatter.to_json(findings)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(content, encoding="utf-8")
+            _ensure_parent_dir(output_path)
+            _write_json_array(findings, output_path)
         elif format == "sarif":
-            content = formatter.to_sarif(findings)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(content, encoding="utf-8")
+            sarif = formatter._build_sarif(findings)
+            _ensure_parent_dir(output_path)
+            output_path.write_bytes(_dumps_bytes(sarif))
         elif format == "html":
-            content = formatter.to_html(findings)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(content, encoding="utf-8")
+            _ensure_parent_dir(output_path)
+            # Chunks are encoded as they are produced and written through a
+            # binary buffer, so no text-layer wrapper sits in between
+            with output_path.open("wb", buffering=_WRITE_BUFFER_SIZE) as f:
+                f.writelines(chunk.encode("utf-8") for chunk in formatter._iter_html(findings))
         elif format == "pdf":
             pdf_content = formatter.to_pdf(findings)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            _ensure_parent_dir(output_path)
             output_path.write_bytes(pdf_content)
         else:
             raise ValueError(f"Unsupported format: {format}. Supported: json, sarif, html, pdf")
@@ -0,0 +1,19 @@
+"""Validation of git refs passed on git and gitleaks command lines."""
+
+import re
+
+# Refs git would parse as an option, or that gitleaks would split into several
+# --log-opts arguments
+_UNSAFE_REF_RE = re.compile(r"^-|\s")
+
+
+def is_safe_ref(ref: str) -> bool:
+    """Check that a git ref can be passed on a git/gitleaks command line.
+
+    Args:
+        ref: Git ref supplied by the caller (e.g. --base-ref)
+
+    Returns:
+        False if the ref starts with "-" or contains whitespace
+    """
+    return bool(ref) and _UNSAFE_REF_RE.search(ref) is None
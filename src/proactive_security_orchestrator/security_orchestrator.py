@@ -2,19 +2,45 @@
 
 import logging
 import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cached_property, partial
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
+from proactive_security_orchestrator.git_refs import is_safe_ref
 from proactive_security_orchestrator.tools.gitleaks_scanner import GitleaksScanner
 from proactive_security_orchestrator.tools.semgrep_analyzer import SemgrepAnalyzer
 from proactive_security_orchestrator.validators.finding_validator import FindingValidator
 
 logger = logging.getLogger(__name__)
 
+# Diffs touching more files than this fall back to a full repository scan
+_MAX_DIFF_FILES = 500
+
+# Values accepted as "on" for boolean feature flags (case-insensitive)
+_TRUE_VALUES = frozenset(("1", "true", "yes", "on"))
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse a boolean feature flag value.
+
+    Args:
+        value: Flag value from the environment
+
+    Returns:
+        True for 1/true/yes/on (any case), False otherwise
+    """
+    return value.strip().lower() in _TRUE_VALUES
+
 
 class SecurityScanner:
     """Parent orchestrator for security scanning."""
 
+    # Content-addressed Semgrep findings cache, used when ENABLE_RESULT_CACHE=true
+    _cache_path = Path(".pso_cache") / "findings.sqlite"
+
     def __init__(
         self,
         config_dir: Path | str = "config",
@@ -32,30 +58,19 @@ class SecurityScanner:
         self.timeout = timeout
         self.env = env or {}
 
-        # Feature flags from environment
-        self.enable_semgrep = os.getenv("ENABLE_SEMGREP", "true").lower() == "true"
-        self.enable_gitleaks = os.getenv("ENABLE_GITLEAKS", "true").lower() == "true"
-        self.strict_validation = os.getenv("STRICT_VALIDATION", "false").lower() == "true"
-
-        # Override with provided env dict
-        if env:
-            self.enable_semgrep = env.get("ENABLE_SEMGREP", str(self.enable_semgrep)).lower() == "true"
-            self.enable_gitleaks = env.get("ENABLE_GITLEAKS", str(self.enable_gitleaks)).lower() == "true"
-            self.strict_validation = env.get("STRICT_VALIDATION", str(self.strict_validation)).lower() == "true"
+        # Feature flags from the process environment, overridden by the env dict
+        flags = {**os.environ, **self.env}
+        self.enable_semgrep = _parse_bool(flags.get("ENABLE_SEMGREP", "true"))
+        self.enable_gitleaks = _parse_bool(flags.get("ENABLE_GITLEAKS", "true"))
+        self.strict_validation = _parse_bool(flags.get("STRICT_VALIDATION", "false"))
+        self.enable_cache = _parse_bool(flags.get("ENABLE_RESULT_CACHE", "false"))
 
         # Check kill switch
-        if os.getenv("ORCHESTRATOR_DISABLED", "false").lower() == "true":
+        if _parse_bool(flags.get("ORCHESTRATOR_DISABLED", "false")):
             logger.warning("Orchestrator disabled via ORCHESTRATOR_DISABLED")
             self.enable_semgrep = False
             self.enable_gitleaks = False
 
-        # Initialize child agents
-        semgrep_config = self.config_dir / "semgrep"
-        gitleaks_config = self.config_dir / "gitleaks"
-
-        self.semgrep = SemgrepAnalyzer(semgrep_config, timeout=self.timeout) if self.enable_semgrep else None
-        self.gitleaks = GitleaksScanner(gitleaks_config, timeout=self.timeout) if self.enable_gitleaks else None
-
         # Initialize validator
         self.validator = FindingValidator()
 
@@ -64,12 +79,35 @@ class SecurityScanner:
             f"Gitleaks={self.enable_gitleaks}, Strict={self.strict_validation}"
         )
 
-    def scan(self, repo_path: str | Path, targets: List[str] | None = None) -> List[Dict[str, Any]]:
+    @cached_property
+    def semgrep(self) -> SemgrepAnalyzer | None:
+        """Semgrep child agent, created on first use (None when disabled)."""
+        if not self.enable_semgrep:
+            return None
+        cache_path = self._cache_path if self.enable_cache else None
+        return SemgrepAnalyzer(self.config_dir / "semgrep", timeout=self.timeout, cache_path=cache_path)
+
+    @cached_property
+    def gitleaks(self) -> GitleaksScanner | None:
+        """Gitleaks child agent, created on first use (None when disabled)."""
+        if not self.enable_gitleaks:
+            return None
+        return GitleaksScanner(self.config_dir / "gitleaks", timeout=self.timeout)
+
+    def scan(
+        self,
+        repo_path: str | Path,
+        targets: List[str] | None = None,
+        base_ref: str | None = None,
+    ) -> List[Dict[str, Any]]:
         """Run security scan on repository.
 
         Args:
             repo_path: Path to repository to scan
             targets: Optional list of specific targets (files/directories). Not used yet.
+            base_ref: Optional git ref to diff against. When given, Semgrep only
+                scans files changed since base_ref and Gitleaks only scans the
+                commits in base_ref..HEAD.
 
         Returns:
             List of validated, de-duplicated findings
@@ -82,72 +120,129 @@ class SecurityScanner:
 
         logger.info(f"Starting security scan on: {repo_path}")
 
-        all_findings: List[Dict[str, Any]] = []
-
-        # Run Semgrep (child agent 1)
+        # Child agents are subprocess-bound, so they run concurrently in threads
+        # and the scan takes as long as the slowest tool rather than the sum
+        child_agents: Dict[str, Callable[[Path], List[Dict[str, Any]]]] = {}
         if self.semgrep:
-            try:
-                logger.debug("Running Semgrep analyzer...")
-                semgrep_findings = self.semgrep.analyze(repo_path)
-                all_findings.extend(semgrep_findings)
-                logger.info(f"Semgrep found {len(semgrep_findings)} findings")
-            except Exception as e:
-                logger.error(f"Semgrep failed: {e}", exc_info=True)
-                if self.strict_validation:
-                    raise
-
-        # Run Gitleaks (child agent 2)
+            child_agents["Semgrep"] = self.semgrep.analyze
         if self.gitleaks:
-            try:
-                logger.debug("Running Gitleaks scanner...")
-                gitleaks_findings = self.gitleaks.scan(repo_path)
-                all_findings.extend(gitleaks_findings)
-                logger.info(f"Gitleaks found {len(gitleaks_findings)} findings")
-            except Exception as e:
-                logger.error(f"Gitleaks failed: {e}", exc_info=True)
-                if self.strict_validation:
-                    raise
+            child_agents["Gitleaks"] = self.gitleaks.scan
+
+        # Diff-aware mode: restrict both tools to what changed since base_ref
+        if base_ref:
+            changed_files = self._changed_files(repo_path, base_ref)
+            if changed_files is not None:
+                logger.info(f"Incremental scan: {len(changed_files)} files changed since {base_ref}")
+                if self.semgrep:
+                    child_agents["Semgrep"] = partial(self.semgrep.analyze, changed_files=changed_files)
+                if self.gitleaks:
+                    child_agents["Gitleaks"] = partial(self.gitleaks.scan, base_ref=base_ref)
+
+        # Each tool's findings are validated as soon as it completes, while
+        # the other tools may still be running
+        tool_findings: Dict[str, List[Dict[str, Any]]] = {}
+        raw_count = 0
+        if child_agents:
+            with ThreadPoolExecutor(max_workers=len(child_agents)) as executor:
+                futures = {}
+                for name, run_agent in child_agents.items():
+                    logger.debug(f"Running {name}...")
+                    futures[executor.submit(run_agent, repo_path)] = name
+
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        findings = future.result()
+                    except Exception as e:
+                        logger.error(f"{name} failed: {e}", exc_info=True)
+                        if self.strict_validation:
+                            raise
+                        continue
+                    logger.info(f"{name} found {len(findings)} findings")
+                    raw_count += len(findings)
+                    tool_findings[name] = list(self.validator.iter_valid(findings))
 
         # If no tools enabled, return empty
         if not self.enable_semgrep and not self.enable_gitleaks:
             logger.warning("No scanning tools enabled. Returning empty findings.")
             return []
 
-        # Validate and de-duplicate all findings
-        logger.debug(f"Validating {len(all_findings)} total findings...")
-        validated_findings = self.validator.validate_all(all_findings)
+        # De-duplicate in a fixed tool order, independent of completion order,
+        # so the same finding always wins
+        validated_findings = self.validator.merge(
+            chain.from_iterable(tool_findings.get(name, ()) for name in child_agents)
+        )
 
         # Log metrics
-        self._log_orchestration_metrics(all_findings, validated_findings)
+        self._log_orchestration_metrics(raw_count, validated_findings)
 
-        logger.info(f"Scan complete. {len(validated_findings)} validated findings (from {len(all_findings)} raw)")
+        logger.info(f"Scan complete. {len(validated_findings)} validated findings (from {raw_count} raw)")
 
         return validated_findings
 
+    def _changed_files(self, repo_path: Path, base_ref: str) -> List[Path] | None:
+        """List files changed between base_ref and HEAD.
+
+        Args:
+            repo_path: Repository (or subdirectory) being scanned
+            base_ref: Git ref to diff against
+
+        Returns:
+            Existing changed files under repo_path, or None if the ref is
+            invalid or the diff cannot be computed or is too large, in which
+            case a full scan is done
+        """
+        if not is_safe_ref(base_ref):
+            logger.warning(f"Invalid base ref {base_ref!r}, running a full scan")
+            return None
+
+        cmd = [
+            "git", "-C", str(repo_path), "diff",
+            "--name-only", "-z",
+            "--relative",  # Paths relative to, and limited to, repo_path
+            "--diff-filter=d",  # Deleted files have nothing left to scan
+            f"{base_ref}...HEAD",
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, timeout=self.timeout, check=False)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"Could not diff against {base_ref}, running a full scan: {e}")
+            return None
+
+        if result.returncode != 0:
+            stderr = result.stderr[:200].decode("utf-8", errors="replace")
+            logger.warning(f"git diff against {base_ref} failed, running a full scan: {stderr}")
+            return None
+
+        names = [name for name in result.stdout.decode("utf-8", errors="surrogateescape").split("\0") if name]
+        if len(names) > _MAX_DIFF_FILES:
+            logger.info(f"{len(names)} files changed since {base_ref}, running a full scan")
+            return None
+
+        changed_files = [repo_path / name for name in names]
+        return [path for path in changed_files if path.is_file()]
+
     def _log_orchestration_metrics(
-        self, raw_findings: List[Dict[str, Any]], validated_findings: List[Dict[str, Any]]
+        self, raw_count: int, validated_findings: List[Dict[str, Any]]
     ) -> None:
         """Log orchestration metrics for observability.
 
         Args:
-            raw_findings: Findings before validation
+            raw_count: Number of findings before validation
             validated_findings: Findings after validation
         """
-        # Count by tool
+        # Count by tool and by severity in one pass
         tool_counts: Dict[str, int] = {}
+        severity_counts: Dict[str, int] = {}
         for finding in validated_findings:
             tool = finding.get("tool", "unknown")
             tool_counts[tool] = tool_counts.get(tool, 0) + 1
-
-        # Count by severity
-        severity_counts: Dict[str, int] = {}
-        for finding in validated_findings:
             severity = finding.get("severity", "info")
             severity_counts[severity] = severity_counts.get(severity, 0) + 1
 
         logger.info(
             f"Orchestration metrics: "
-            f"Raw={len(raw_findings)}, Validated={len(validated_findings)}, "
+            f"Raw={raw_count}, Validated={len(validated_findings)}, "
             f"Tools={tool_counts}, Severity={severity_counts}"
         )
 
@@ -4,11 +4,107 @@ import json
 import logging
 import re
 import subprocess
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, List, Tuple
+
+from proactive_security_orchestrator.git_refs import is_safe_ref
+
+try:
+    import orjson
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    # handle both parsers the same way
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Read buffer for the Gitleaks stdout pipe
+_PIPE_BUFFER_SIZE = 1 << 20
+
+# Finding confidence: 0.7 + entropy / 10, capped at 0.95 (reached at entropy 2.5)
+_CONFIDENCE_BASE = 0.7
+_CONFIDENCE_CAP = 0.95
+_CONFIDENCE_CAP_ENTROPY = 2.5
+
+
+def _redact(secret: str) -> str:
+    """Redact secret value for safe logging.
+
+    Args:
+        secret: Secret string to redact
+
+    Returns:
+        Redacted string (first 4 chars + ... + last 4 chars, or [REDACTED])
+    """
+    if not secret:
+        return "[REDACTED]"
+
+    secret_str = str(secret)
+    if len(secret_str) <= 8:
+        return "[REDACTED]"
+
+    # Show first 4 and last 4 characters, mask the rest
+    return f"{secret_str[:4]}...{secret_str[-4:]}"
+
+
+def _gitleaks_to_finding(gitleaks_match: Dict[str, Any]) -> Dict[str, Any] | None:
+    """Convert Gitleaks match to standard finding format.
+
+    Args:
+        gitleaks_match: Gitleaks JSON match object
+
+    Returns:
+        Standard finding dictionary (with secrets redacted) or None if invalid
+    """
+    try:
+        get = gitleaks_match.get
+        rule_id = get("RuleID", "")
+        file_path = get("File", "")
+        line_num = get("StartLine", 0)
+        secret = get("Secret", "")
+        match = get("Match", "")
+        entropy = get("Entropy", 0.0)
+
+        # Redact secret value (replace with placeholder)
+        redacted_secret = _redact(secret or match)
+
+        # Get code snippet (redacted)
+        code_snippet = ""
+        if "Line" in gitleaks_match:
+            code_snippet = _redact(str(gitleaks_match["Line"]))
+
+        # Higher entropy = higher confidence, capped once entropy reaches 2.5
+        if entropy >= _CONFIDENCE_CAP_ENTROPY:
+            confidence = _CONFIDENCE_CAP
+        else:
+            confidence = _CONFIDENCE_BASE + entropy / 10
+
+        finding = {
+            "finding": f"Secret detected: {rule_id}",
+            "evidence": [
+                {
+                    "path": file_path,
+                    "lines": f"L{line_num}",
+                    "why_relevant": f"Gitleaks detected potential secret with entropy {entropy:.2f}",
+                    "code_snippet": code_snippet or "[REDACTED]",
+                }
+            ],
+            "confidence": confidence,
+            "tool": "gitleaks",
+            "severity": "critical",  # Secrets are always critical
+            "rule_id": rule_id,
+            "remediation": f"Remove secret from code and rotate credentials. Match: {redacted_secret}",
+        }
+
+        return finding
+
+    except (KeyError, AttributeError) as e:
+        logger.warning(f"Failed to convert Gitleaks match: {e}")
+        return None
+
 
 class GitleaksScanner:
     """Child agent for Gitleaks secrets detection."""
@@ -24,11 +120,13 @@ class GitleaksScanner:
         self.ignore_path = self.config_dir / ".gitleaksignore"
         self.timeout = timeout
 
-    def scan(self, repo_path: str | Path) -> List[Dict[str, Any]]:
+    def scan(self, repo_path: str | Path, base_ref: str | None = None) -> List[Dict[str, Any]]:
         """Run Gitleaks scan on repository.
 
         Args:
             repo_path: Path to repository to scan
+            base_ref: Optional git ref; when given only commits in base_ref..HEAD
+                are scanned instead of the full history
 
         Returns:
             List of findings in standard format (with secrets redacted)
@@ -45,6 +143,11 @@ class GitleaksScanner:
                 "--json",
                 "--no-banner",
             ]
+            if base_ref:
+                if is_safe_ref(base_ref):
+                    cmd += ["--log-opts", f"{base_ref}..HEAD"]
+                else:
+                    logger.warning(f"Ignoring invalid base ref {base_ref!r}, scanning full history")
 
             # Add config if it exists
             if self.ignore_path.exists():
@@ -54,42 +157,25 @@ class GitleaksScanner:
 
             logger.debug(f"Running: {' '.join(cmd)}")
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout,
-                check=False,
-            )
-
-            # Gitleaks returns non-zero exit code when findings are detected
-            # Exit code 1 = findings found, 0 = no findings, 2 = error
-            if result.returncode == 2:
-                logger.error(f"Gitleaks error: {result.stderr[:200]}")
-                return []
-
-            # Parse JSON output
-            output = result.stdout.strip()
-            if not output:
-                # No findings or empty output
-                return []
-
-            try:
-                # Gitleaks outputs one JSON object per line
-                findings = []
-                for line in output.split("\n"):
-                    if line.strip():
-                        data = json.loads(line)
-                        finding = self._to_finding(data)
-                        if finding:
-                            findings.append(finding)
-
+            # stderr goes to a temp file so it can never fill a pipe and stall gitleaks
+            with tempfile.TemporaryFile() as stderr_file:
+                try:
+                    findings, returncode = self._run_streaming(cmd, stderr_file)
+                except json.JSONDecodeError as e:
+                    logger.error(f"Failed to parse Gitleaks JSON output: {e}")
+                    return []
+
+                # Gitleaks returns non-zero exit code when findings are detected
+                # Exit code 1 = findings found, 0 = no findings, 2 = error
+                if returncode == 2:
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read(200).decode("utf-8", errors="replace")
+                    logger.error(f"Gitleaks error: {stderr}")
+                    return []
+
+            if findings:
                 logger.info(f"Gitleaks found {len(findings)} secrets")
-                return findings
-
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse Gitleaks JSON output: {e}")
-                return []
+            return findings
 
         except subprocess.TimeoutExpired:
             logger.error(f"Gitleaks timed out after {self.timeout}s")
@@ -104,70 +190,66 @@ class GitleaksScanner:
             logger.error(f"Error running Gitleaks: {e}", exc_info=True)
             return []
 
-    def _to_finding(self, gitleaks_match: Dict[str, Any]) -> Dict[str, Any] | None:
-        """Convert Gitleaks match to standard finding format.
+    def _run_streaming(self, cmd: List[str], stderr_file: IO[bytes]) -> Tuple[List[Dict[str, Any]], int]:
+        """Run Gitleaks and convert its output line by line as it is produced.
 
         Args:
-            gitleaks_match: Gitleaks JSON match object
+            cmd: Gitleaks command line
+            stderr_file: Binary file that receives Gitleaks stderr
 
         Returns:
-            Standard finding dictionary (with secrets redacted) or None if invalid
-        """
-        try:
-            rule_id = gitleaks_match.get("RuleID", "")
-            file_path = gitleaks_match.get("File", "")
-            line_num = gitleaks_match.get("StartLine", 0)
-            secret = gitleaks_match.get("Secret", "")
-            match = gitleaks_match.get("Match", "")
-            entropy = gitleaks_match.get("Entropy", 0.0)
-
-            # Redact secret value (replace with placeholder)
-            redacted_secret = self._redact_secret(secret or match)
-
-            # Get code snippet (redacted)
-            code_snippet = ""
-            if "Line" in gitleaks_match:
-                code_snippet = self._redact_secret(str(gitleaks_match["Line"]))
-
-            finding = {
-                "finding": f"Secret detected: {rule_id}",
-                "evidence": [
-                    {
-                        "path": file_path,
-                        "lines": f"L{line_num}",
-                        "why_relevant": f"Gitleaks detected potential secret with entropy {entropy:.2f}",
-                        "code_snippet": code_snippet or "[REDACTED]",
-                    }
-                ],
-                "confidence": min(0.7 + (entropy / 10), 0.95),  # Higher entropy = higher confidence
-                "tool": "gitleaks",
-                "severity": "critical",  # Secrets are always critical
-                "rule_id": rule_id,
-                "remediation": f"Remove secret from code and rotate credentials. Match: {redacted_secret}",
-            }
-
-            return finding
-
-        except (KeyError, AttributeError) as e:
-            logger.warning(f"Failed to convert Gitleaks match: {e}")
-            return None
-
-    def _redact_secret(self, secret: str) -> str:
-        """Redact secret value for safe logging.
-
-        Args:
-            secret: Secret string to redact
+            Tuple of (findings, exit code)
 
-        Returns:
-            Redacted string (first 4 chars + ... + last 4 chars, or [REDACTED])
+        Raises:
+            subprocess.TimeoutExpired: If Gitleaks runs longer than the timeout
+            json.JSONDecodeError: If an output line is not valid JSON
         """
-        if not secret:
-            return "[REDACTED]"
-
-        secret_str = str(secret)
-        if len(secret_str) <= 8:
-            return "[REDACTED]"
-
-        # Show first 4 and last 4 characters, mask the rest
-        return f"{secret_str[:4]}...{secret_str[-4:]}"
-
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            bufsize=_PIPE_BUFFER_SIZE,
+        )
+
+        timed_out = threading.Event()
+
+        def _kill() -> None:
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(self.timeout, _kill)
+        timer.daemon = True
+        timer.start()
+
+        findings: List[Dict[str, Any]] = []
+        loads = _loads
+        to_finding = _gitleaks_to_finding
+        append_finding = findings.append
+        try:
+            # Gitleaks outputs one JSON object per line
+            for line in proc.stdout:
+                # The JSON decoder ignores surrounding whitespace, so lines are
+                # parsed as read rather than copied by strip()
+                if line.isspace():
+                    continue
+                data = loads(line)
+                finding = to_finding(data)
+                if finding:
+                    append_finding(finding)
+            proc.wait()
+        except json.JSONDecodeError:
+            # Killing Gitleaks mid-write leaves a partial last line
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(cmd, self.timeout) from None
+            raise
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, self.timeout)
+
+        return findings, proc.returncode
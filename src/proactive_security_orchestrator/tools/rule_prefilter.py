@@ -0,0 +1,260 @@
+"""Literal-string prefilter that skips files no Semgrep rule can match."""
+
+import functools
+import logging
+import mmap
+import re
+from pathlib import Path
+from typing import Any, Iterable, List, Set
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Identifiers shorter than this are too common to be worth filtering on
+_MIN_LITERAL_LENGTH = 4
+
+_IDENTIFIER_RE = re.compile(rf"[A-Za-z_][A-Za-z0-9_]{{{_MIN_LITERAL_LENGTH - 1},}}")
+
+# Metavariables ($X, $...ARGS) match arbitrary code, so their names never appear
+_METAVARIABLE_RE = re.compile(r"\$(?:\.\.\.)?[A-Z_][A-Z0-9_]*")
+
+# Quoted string literals; Semgrep may match their contents loosely, so their
+# words are not reliable literals
+_STRING_LITERAL_RE = re.compile(r""""(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'""")
+
+# Regex string literal ("=~/.../"), which matches strings no literal can describe
+_REGEX_STRING_MARKER = "=~/"
+
+# Positive sub-pattern keys inside a `patterns` conjunction
+_POSITIVE_KEYS = ("pattern", "pattern-either", "patterns", "pattern-inside")
+
+# Bytes searched per Aho-Corasick pass, so large files are never copied whole
+_AUTOMATON_CHUNK_SIZE = 1 << 20
+
+
+def _text_literals(pattern: Any) -> Set[str] | None:
+    """Extract the identifiers of a single Semgrep pattern string.
+
+    Args:
+        pattern: Pattern source
+
+    Returns:
+        Lower-case identifiers (any match contains all of them), or None if
+        the pattern has none or contains a regex string literal
+    """
+    if not isinstance(pattern, str) or _REGEX_STRING_MARKER in pattern:
+        return None
+    code = _METAVARIABLE_RE.sub(" ", _STRING_LITERAL_RE.sub(" ", pattern))
+    literals = {literal.lower() for literal in _IDENTIFIER_RE.findall(code)}
+    return literals or None
+
+
+def _pattern_literals(node: Any) -> Set[str] | None:
+    """Extract literals at least one of which appears in any match of a pattern node.
+
+    Args:
+        node: Rule or sub-pattern mapping
+
+    Returns:
+        Set of lower-case literals, or None if no such set can be derived
+        (the node could then match a file containing none of them)
+    """
+    if not isinstance(node, dict):
+        return None
+
+    if "pattern" in node:
+        return _text_literals(node["pattern"])
+    if "pattern-inside" in node:
+        return _text_literals(node["pattern-inside"])
+
+    if "pattern-either" in node:
+        # Any alternative may match, so every alternative must contribute literals
+        literals: Set[str] = set()
+        for alternative in node["pattern-either"] or ():
+            alternative_literals = _pattern_literals(alternative)
+            if alternative_literals is None:
+                return None
+            literals |= alternative_literals
+        return literals or None
+
+    if "patterns" in node:
+        # All positive sub-patterns must match; the most selective one suffices
+        candidates = [
+            _pattern_literals(item)
+            for item in node["patterns"] or ()
+            if isinstance(item, dict) and any(key in item for key in _POSITIVE_KEYS)
+        ]
+        candidates = [literals for literals in candidates if literals is not None]
+        return min(candidates, key=len) if candidates else None
+
+    # pattern-regex, taint mode, registry references, ...: unknown
+    return None
+
+
+def _rule_literals(rules: Iterable[Any]) -> Set[str] | None:
+    """Collect the prefilter literals for a whole rule set.
+
+    Args:
+        rules: Semgrep rule mappings
+
+    Returns:
+        Union of every rule's literals, or None if any rule cannot be prefiltered
+    """
+    literals: Set[str] = set()
+    for rule in rules:
+        if not isinstance(rule, dict) or rule.get("mode", "search") != "search":
+            return None
+        rule_literals = _pattern_literals(rule)
+        if rule_literals is None:
+            logger.debug(f"Semgrep rule {rule.get('id', '?')} has no literals; prefilter disabled")
+            return None
+        literals |= rule_literals
+    return literals or None
+
+
+class LiteralMatcher:
+    """Multi-literal search over file contents.
+
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, otherwise
+    a compiled regex alternation. Matching is case-insensitive, which is
+    conservative for languages with case-insensitive identifiers.
+    """
+
+    def __init__(self, literals: Iterable[str]) -> None:
+        """Build the matcher.
+
+        Args:
+            literals: Lower-case literals to search for
+        """
+        self.literals = sorted(set(literals))
+        # Chunks overlap by this much so literals spanning a boundary are found
+        self._overlap = max(map(len, self.literals), default=1) - 1
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for literal in self.literals:
+                self._automaton.add_word(literal, literal)
+            self._automaton.make_automaton()
+        else:
+            # Longest first so the alternation prefers full identifiers
+            alternation = b"|".join(
+                re.escape(literal.encode("ascii"))
+                for literal in sorted(self.literals, key=len, reverse=True)
+            )
+            self._regex = re.compile(alternation, re.IGNORECASE)
+
+    def matches(self, data: bytes | mmap.mmap) -> bool:
+        """Check whether the data contains any literal.
+
+        Args:
+            data: File contents
+
+        Returns:
+            True if at least one literal occurs
+        """
+        if AHOCORASICK_AVAILABLE:
+            for start in range(0, len(data), _AUTOMATON_CHUNK_SIZE):
+                chunk = data[start:start + _AUTOMATON_CHUNK_SIZE + self._overlap]
+                # Literals are ASCII, so a latin-1 decode maps bytes 1:1 onto characters
+                text = chunk.lower().decode("latin-1")
+                if next(self._automaton.iter(text), None) is not None:
+                    return True
+            return False
+        return self._regex.search(data) is not None
+
+    def matches_file(self, path: Path) -> bool:
+        """Check whether a file contains any literal.
+
+        Unreadable files are kept so Semgrep can report on them as before.
+
+        Args:
+            path: File to search
+
+        Returns:
+            True if the file may match a rule and must be scanned
+        """
+        try:
+            with open(path, "rb") as f:
+                # mmap lets the search run without reading the whole file into memory
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return self.matches(data)
+        except ValueError:
+            # Empty files cannot be mapped, and contain no literals
+            return False
+        except OSError:
+            return True
+
+    def filter(self, paths: Iterable[Path]) -> List[Path]:
+        """Keep only files that contain at least one literal.
+
+        Args:
+            paths: Candidate files
+
+        Returns:
+            Files that may match a rule, in input order
+        """
+        return [path for path in paths if self.matches_file(path)]
+
+
+def build_literal_matcher(rules_path: Path) -> LiteralMatcher | None:
+    """Build a prefilter for a Semgrep rules file.
+
+    Args:
+        rules_path: Semgrep rules YAML
+
+    Returns:
+        LiteralMatcher, or None if the rules cannot be prefiltered (PyYAML
+        missing, unparsable file, or a rule without extractable literals)
+    """
+    if not YAML_AVAILABLE:
+        return None
+    try:
+        stat = rules_path.stat()
+    except OSError:
+        return None
+    return _load_literal_matcher(str(rules_path), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_literal_matcher(rules_path: str, mtime_ns: int, size: int) -> LiteralMatcher | None:
+    """Parse a rules file and build its matcher.
+
+    Cached per file, modification time and size, so analyzers sharing an
+    unchanged rules file parse it only once. Matchers are never mutated
+    after construction and can be shared.
+
+    Args:
+        rules_path: Semgrep rules YAML
+        mtime_ns: Modification time of the file (part of the cache key)
+        size: Size of the file (part of the cache key)
+
+    Returns:
+        LiteralMatcher, or None if the rules cannot be prefiltered
+    """
+    # The libyaml-backed loader is much faster when available
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        with open(rules_path, "rb") as f:
+            config = yaml.load(f, Loader=loader)
+    except (OSError, yaml.YAMLError) as e:
+        logger.debug(f"Could not parse {rules_path} for prefiltering: {e}")
+        return None
+
+    rules = config.get("rules") if isinstance(config, dict) else None
+    if not rules:
+        return None
+
+    literals = _rule_literals(rules)
+    if literals is None:
+        return None
+    return LiteralMatcher(literals)
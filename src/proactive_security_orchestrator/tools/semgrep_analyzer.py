@@ -1,106 +1,590 @@
 """Semgrep analyzer child agent."""
 
+import functools
 import json
 import logging
+import os
+import re
+import shutil
 import subprocess
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
+
+from proactive_security_orchestrator.cache.findings_cache import (
+    FindingsCache,
+    hash_file,
+    hash_files,
+)
+from proactive_security_orchestrator.tools.rule_prefilter import build_literal_matcher
+
+try:
+    import orjson
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    # handle both parsers the same way
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Top-level directories with at least this many files get their own Semgrep shard
+_SHARD_MIN_FILES = 200
+
+# Upper bound on parallel Semgrep processes (each loads the full rule set)
+_MAX_SHARDS = 4
+
+# Semgrep severity -> standard severity, pre-seeded with the case variants
+# seen in rule files so the lookup needs no per-result str.upper()
+_SEVERITY_MAP = {
+    spelling: standard
+    for level, standard in (("ERROR", "critical"), ("WARNING", "high"), ("INFO", "medium"))
+    for spelling in (level, level.lower(), level.title())
+}
+
+# At most this many files are passed to Semgrep as explicit targets (cache
+# misses, prefilter survivors); larger sets scan the directory instead
+_MAX_EXPLICIT_TARGETS = 1000
+
+# Flags for every Semgrep run: no telemetry, no version-check request
+_SEMGREP_BASE_ARGS = ["--metrics=off", "--disable-version-check", "--optimizations", "all"]
+
+# Semgrep's default security ruleset, used when no custom rules exist. It is
+# downloaded once and reused so Semgrep doesn't fetch and parse it every run
+# ("--config auto" additionally refuses to run with metrics off)
+_DEFAULT_RULES_URL = "https://semgrep.dev/c/p/default"
+_DEFAULT_RULES_CACHE = Path.home() / ".cache" / "pso" / "auto.yml"
+_DEFAULT_RULES_MAX_AGE = 24 * 60 * 60
+_DEFAULT_RULES_FETCH_TIMEOUT = 30
+
+# Rules referencing registry rulesets (p/..., r/...) change without the rules
+# file changing, so their cached findings expire after this many seconds
+_REGISTRY_RULE_RE = re.compile(rb"""^\s*-?\s*id:\s*["']?[pr]/""", re.MULTILINE)
+_REGISTRY_CACHE_MAX_AGE = 24 * 60 * 60
+
+_VERSION_TIMEOUT = 30
+
+# Remediation guidance by rule ID keyword; earlier entries win when a rule
+# ID contains keywords of several entries
+_REMEDIATION_RULES = (
+    (
+        ("deserialization", "pickle"),
+        "Avoid using pickle for deserializing untrusted data. Use JSON or other safe serialization formats. If pickle is necessary, ensure data comes from trusted sources only.",
+    ),
+    (
+        ("xss", "jinja2"),
+        "Use Flask's auto-escaping or manually escape user input before rendering in templates. Never render user input directly without escaping.",
+    ),
+    (
+        ("secrets", "private-key"),
+        "Remove hardcoded secrets, API keys, or private keys from code. Use environment variables, secret management systems, or secure vaults. Rotate any exposed credentials immediately.",
+    ),
+    (
+        ("injection",),
+        "Use parameterized queries or prepared statements. Never concatenate user input directly into queries or commands.",
+    ),
+)
+_REMEDIATION_RANK = {
+    keyword: rank
+    for rank, (keywords, _) in enumerate(_REMEDIATION_RULES)
+    for keyword in keywords
+}
+# One case-insensitive scan of the rule ID finds every keyword
+_REMEDIATION_RE = re.compile("|".join(map(re.escape, _REMEDIATION_RANK)), re.IGNORECASE)
+
+
+def _has_min_files(path: str, min_files: int) -> bool:
+    """Check whether a directory tree holds at least min_files files.
+
+    Stops walking as soon as the threshold is reached.
+
+    Args:
+        path: Directory to check
+        min_files: File count threshold
+
+    Returns:
+        True if the tree contains at least min_files files
+    """
+    count = 0
+    for _, dirnames, filenames in os.walk(path):
+        # Hidden directories (.git, caches) do not count towards the size
+        dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+        count += len(filenames)
+        if count >= min_files:
+            return True
+    return False
+
+
+def _list_repo_files(repo_path: Path) -> List[Path] | None:
+    """List the files Semgrep would scan in a repository.
+
+    Uses git (tracked plus untracked, non-ignored files) so .gitignore is
+    honoured as in a Semgrep run over the directory.
+
+    Args:
+        repo_path: Repository root
+
+    Returns:
+        Files in the repository, or None if they cannot be listed with git
+    """
+    cmd = [
+        "git", "-C", str(repo_path), "ls-files",
+        "-z", "--cached", "--others", "--exclude-standard",
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, check=False)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+
+    names = result.stdout.decode("utf-8", errors="surrogateescape").split("\0")
+    files = (repo_path / name for name in names if name)
+    # The index may still list files deleted from the working tree
+    return [path for path in files if path.is_file()]
+
+
+def _default_rules_config(cache_path: Path = _DEFAULT_RULES_CACHE) -> str:
+    """Get the Semgrep --config value for the default security ruleset.
+
+    Refreshes the locally cached copy of the ruleset when it is older than
+    _DEFAULT_RULES_MAX_AGE.
+
+    Args:
+        cache_path: Local copy of the default ruleset
+
+    Returns:
+        Path of the cached ruleset, or the registry name if it cannot be downloaded
+    """
+    try:
+        age = time.time() - cache_path.stat().st_mtime
+    except OSError:
+        age = None
+    if age is not None and age < _DEFAULT_RULES_MAX_AGE:
+        return str(cache_path)
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write next to the cache and rename, so concurrent scans never read a partial file
+        with tempfile.NamedTemporaryFile(dir=cache_path.parent, suffix=".tmp", delete=False) as f:
+            try:
+                with urllib.request.urlopen(
+                    _DEFAULT_RULES_URL, timeout=_DEFAULT_RULES_FETCH_TIMEOUT
+                ) as response:
+                    shutil.copyfileobj(response, f)
+            except BaseException:
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, cache_path)
+        return str(cache_path)
+    except OSError as e:
+        logger.warning(f"Could not download Semgrep default rules: {e}")
+        # A stale copy is still better than fetching the registry on every run
+        return str(cache_path) if age is not None else "p/default"
+
+
+def _semgrep_version() -> str:
+    """Identify the installed Semgrep, for the findings cache key.
+
+    Returns:
+        Output of ``semgrep --version``, or "" if Semgrep cannot be found
+    """
+    executable = shutil.which("semgrep")
+    if executable is None:
+        return ""
+    try:
+        stat = os.stat(executable)
+    except OSError:
+        return ""
+    return _load_semgrep_version(executable, stat.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_semgrep_version(executable: str, mtime_ns: int) -> str:
+    """Run ``semgrep --version``.
+
+    Cached per executable and modification time, so an upgrade is noticed.
+
+    Args:
+        executable: Path of the semgrep executable
+        mtime_ns: Modification time of the executable (part of the cache key)
+
+    Returns:
+        Semgrep version, or "" if it cannot be determined
+    """
+    try:
+        result = subprocess.run(
+            [executable, "--version"], capture_output=True, timeout=_VERSION_TIMEOUT, check=False
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    return result.stdout.decode("utf-8", errors="replace").strip()
+
+
+def _cache_path_key(path: Path, repo_path: Path) -> str:
+    """Path of a file as stored in the findings cache.
+
+    Args:
+        path: Scanned file
+        repo_path: Repository root
+
+    Returns:
+        POSIX path relative to the repository root when the file is inside it
+    """
+    try:
+        return path.relative_to(repo_path).as_posix()
+    except ValueError:
+        return path.as_posix()
+
 
 class SemgrepAnalyzer:
     """Child agent for Semgrep static analysis."""
 
-    def __init__(self, config_dir: Path | str, timeout: int = 60) -> None:
+    def __init__(
+        self, config_dir: Path | str, timeout: int = 60, cache_path: Path | str | None = None
+    ) -> None:
         """Initialize Semgrep analyzer.
 
         Args:
             config_dir: Directory containing Semgrep config (rules.yaml)
             timeout: Timeout in seconds for Semgrep execution
+            cache_path: Optional SQLite file caching findings per file content;
+                files unchanged since a previous scan are not re-analyzed
         """
         self.config_dir = Path(config_dir)
         self.rules_path = self.config_dir / "rules.yaml"
         self.timeout = timeout
-
-    def analyze(self, repo_path: str | Path) -> List[Dict[str, Any]]:
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        # Parsed once; None when the rules cannot be prefiltered
+        self._literal_matcher = build_literal_matcher(self.rules_path)
+        # Resolved on first use; the default ruleset may need a download
+        self._config: str | None = None
+
+    def analyze(
+        self, repo_path: str | Path, changed_files: List[Path] | None = None
+    ) -> List[Dict[str, Any]]:
         """Run Semgrep analysis on repository.
 
+        Large repositories are split into shards of top-level directories that
+        are scanned by parallel Semgrep processes; small ones use a single run.
+
         Args:
             repo_path: Path to repository to scan
+            changed_files: Optional files to scan instead of the whole
+                repository (incremental scans)
 
         Returns:
             List of findings in standard format
         """
         repo_path = Path(repo_path)
 
+        if changed_files is not None and not changed_files:
+            logger.info("No changed files to scan with Semgrep")
+            return []
+
         try:
-            # Run semgrep with JSON output
             # Use custom rules if available, otherwise use Semgrep's default security rules
             if self.rules_path.exists():
-                cmd = [
-                    "semgrep",
-                    "--config",
-                    str(self.rules_path),
-                    "--json",
-                    str(repo_path),
-                ]
+                self._config = str(self.rules_path)
             else:
                 logger.info(f"Semgrep rules not found at {self.rules_path}. Using default security rules.")
-                cmd = [
-                    "semgrep",
-                    "--config", "auto",  # Use Semgrep's auto-config (security-focused rules)
-                    "--json",
-                    str(repo_path),
-                ]
+                if self._config is None:
+                    self._config = _default_rules_config()
+
+            # Skip files that contain none of the rules' literal strings
+            if self._literal_matcher is not None:
+                files = changed_files if changed_files is not None else _list_repo_files(repo_path)
+                if files is not None:
+                    candidates = self._literal_matcher.filter(files)
+                    logger.debug(f"Semgrep prefilter kept {len(candidates)} of {len(files)} files")
+                    # Huge candidate lists don't fit a command line; scan the directory instead
+                    if changed_files is not None or len(candidates) <= _MAX_EXPLICIT_TARGETS:
+                        if not candidates:
+                            logger.info("Semgrep found 0 issues")
+                            return []
+                        changed_files = candidates
+
+            # Cached findings are only valid for a fixed, local rule set
+            if self.cache_path is not None and self.rules_path.exists():
+                findings = self._analyze_cached(repo_path, changed_files)
+            else:
+                findings, _ = self._collect(repo_path, changed_files)
+
+            logger.info(f"Semgrep found {len(findings)} issues")
+            return findings
+
+        except subprocess.TimeoutExpired:
+            logger.error(f"Semgrep timed out after {self.timeout}s")
+            return []
+        except FileNotFoundError:
+            logger.error("Semgrep command not found. Install with: pip install semgrep or brew install semgrep")
+            return []
+        except Exception as e:
+            logger.error(f"Error running Semgrep: {e}", exc_info=True)
+            return []
+
+    def _analyze_cached(
+        self, repo_path: Path, changed_files: List[Path] | None
+    ) -> List[Dict[str, Any]]:
+        """Analyze files, reusing cached findings for files whose path and content are unchanged.
+
+        Only cache misses are passed to Semgrep; their findings are stored
+        unless a Semgrep run produced unusable output.
+
+        Args:
+            repo_path: Path to repository to scan
+            changed_files: Optional files to scan instead of the whole repository
+
+        Returns:
+            List of findings in standard format
+        """
+        files = changed_files if changed_files is not None else _list_repo_files(repo_path)
+        if files is None:
+            findings, _ = self._collect(repo_path, None)
+            return findings
+
+        rules_hash = self._rules_cache_key()
+        # Unreadable files are left out: Semgrep cannot analyze them either
+        keys = {
+            path: (_cache_path_key(path, repo_path), file_hash)
+            for path, file_hash in hash_files(files).items()
+        }
+
+        with FindingsCache(self.cache_path) as cache:
+            cached = cache.get_many(keys.values(), rules_hash)
+            misses = [path for path, key in keys.items() if key not in cached]
+
+            findings: List[Dict[str, Any]] = []
+            for path, key in keys.items():
+                # The repository may have moved since the entry was stored
+                for finding in cached.get(key, ()):
+                    evidence = [{**item, "path": str(path)} for item in finding["evidence"]]
+                    findings.append({**finding, "evidence": evidence})
+
+            logger.info(f"Semgrep cache: {len(keys) - len(misses)} hits, {len(misses)} misses")
+            if not misses:
+                return findings
+
+            # Too many files for one command line: rescan everything instead
+            full_scan = changed_files is None and len(misses) > _MAX_EXPLICIT_TARGETS
+            fresh, complete = self._collect(repo_path, None if full_scan else misses)
+            if full_scan:
+                findings = fresh
+            else:
+                findings.extend(fresh)
+
+            # Never cache the (missing) findings of a run whose output was unusable
+            if complete:
+                by_path: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+                for finding in fresh:
+                    by_path[finding["evidence"][0]["path"]].append(finding)
+                cache.put_many(
+                    ((*keys[path], by_path.get(str(path), [])) for path in misses),
+                    rules_hash,
+                )
+
+        return findings
+
+    def _rules_cache_key(self) -> str:
+        """Identify the rule set and Semgrep version findings are produced with.
+
+        Returns:
+            Hash of the rules file and the Semgrep version, plus the current
+            time window when the rules reference registry rulesets
+        """
+        rules_hash = hash_file(self.rules_path)
+        key = f"{rules_hash}:{_semgrep_version()}"
+        if _REGISTRY_RULE_RE.search(self.rules_path.read_bytes()):
+            key += f":{int(time.time() // _REGISTRY_CACHE_MAX_AGE)}"
+        return key
+
+    def _collect(
+        self, repo_path: Path, targets: List[Path] | None
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Run Semgrep and gather its findings.
+
+        Whole-repository scans are sharded across processes when large.
+
+        Args:
+            repo_path: Path to repository to scan
+            targets: Optional files to scan instead of the whole repository
+
+        Returns:
+            Tuple of (findings, whether every run's output was usable)
+        """
+        if targets is not None:
+            shards = [targets]
+        else:
+            shards = self._shard_paths(repo_path, min(os.cpu_count() or 1, _MAX_SHARDS)) or [[repo_path]]
+
+        if len(shards) == 1:
+            outputs = [self._scan_shard(shards[0])]
+        else:
+            logger.debug(f"Scanning {repo_path} in {len(shards)} Semgrep shards")
+            with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+                # map() yields in shard order, keeping the output deterministic
+                outputs = list(executor.map(self._scan_shard, shards))
+
+        findings: List[Dict[str, Any]] = []
+        for output in outputs:
+            if output is not None:
+                findings.extend(output)
+        return findings, None not in outputs
+
+    def _scan_shard(self, targets: List[Path]) -> List[Dict[str, Any]] | None:
+        """Run one Semgrep process and convert its results.
+
+        Conversion happens in the shard's worker thread, so it overlaps with
+        the Semgrep processes of the other shards that are still running.
+
+        Args:
+            targets: Files or directories to scan
 
-            logger.debug(f"Running: {' '.join(cmd)}")
+        Returns:
+            Findings, or None if Semgrep produced no usable output
+        """
+        results = self._run_semgrep(targets)
+        if results is None:
+            return None
+        return self._to_findings(results)
+
+    def _to_findings(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert Semgrep results to standard finding format.
+
+        Args:
+            results: Raw Semgrep result objects
+
+        Returns:
+            Findings, skipping results that could not be converted
+        """
+        findings: List[Dict[str, Any]] = []
+        # Bound once: this loop runs for every Semgrep result
+        to_finding = self._to_finding
+        append_finding = findings.append
+        for result in results:
+            finding = to_finding(result)
+            if finding:
+                append_finding(finding)
+        return findings
+
+    def _build_command(self, targets: List[Path]) -> List[str]:
+        """Build the Semgrep command line for the given scan targets.
+
+        Args:
+            targets: Files or directories to scan
+
+        Returns:
+            Command argument list
+        """
+        config = self._config or str(self.rules_path)
+        return [
+            "semgrep",
+            "--config", config,
+            "--json",
+            *_SEMGREP_BASE_ARGS,
+            *(str(target) for target in targets),
+        ]
+
+    def _run_semgrep(self, targets: List[Path]) -> List[Dict[str, Any]] | None:
+        """Run one Semgrep process and return its raw results.
+
+        Args:
+            targets: Files or directories to scan
+
+        Returns:
+            Raw Semgrep result objects, or None if Semgrep produced no usable output
 
+        Raises:
+            subprocess.TimeoutExpired: If Semgrep runs longer than the timeout
+            FileNotFoundError: If the semgrep command is not installed
+        """
+        cmd = self._build_command(targets)
+        logger.debug(f"Running: {' '.join(cmd)}")
+
+        # stderr goes to a temp file rather than memory: verbose rule errors
+        # can run to megabytes, and only the start of it is ever logged
+        with tempfile.TemporaryFile() as stderr_file:
+            # Output stays bytes: the JSON decoder reads UTF-8 directly, so the
+            # (potentially very large) report is never decoded into a str first
             result = subprocess.run(
                 cmd,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
                 timeout=self.timeout,
                 check=False,
             )
 
             if result.returncode != 0:
+                stderr_file.seek(0)
+                stderr = stderr_file.read(200).decode("utf-8", errors="replace")
                 logger.warning(
                     f"Semgrep exited with code {result.returncode}. "
-                    f"stderr: {result.stderr[:200]}"
+                    f"stderr: {stderr}"
                 )
                 # Semgrep may return non-zero for findings, try to parse anyway
                 if not result.stdout.strip():
-                    return []
+                    return None
 
-            # Parse JSON output
-            try:
-                data = json.loads(result.stdout)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse Semgrep JSON output: {e}")
-                return []
+        # Parse JSON output
+        try:
+            data = _loads(result.stdout)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse Semgrep JSON output: {e}")
+            return None
 
-            # Convert Semgrep results to standard finding format
-            findings = []
-            results = data.get("results", [])
+        return data.get("results", [])
 
-            for result in results:
-                finding = self._to_finding(result)
-                if finding:
-                    findings.append(finding)
+    @staticmethod
+    def _shard_paths(repo_path: Path, max_shards: int) -> List[List[Path]] | None:
+        """Split a repository into scan shards for parallel Semgrep runs.
 
-            logger.info(f"Semgrep found {len(findings)} issues")
-            return findings
+        Each top-level directory with at least _SHARD_MIN_FILES files becomes
+        a shard target; the remaining top-level entries are scanned together.
+        Targets are spread over at most max_shards shards.
 
-        except subprocess.TimeoutExpired:
-            logger.error(f"Semgrep timed out after {self.timeout}s")
-            return []
-        except FileNotFoundError:
-            logger.error("Semgrep command not found. Install with: pip install semgrep or brew install semgrep")
-            return []
-        except Exception as e:
-            logger.error(f"Error running Semgrep: {e}", exc_info=True)
-            return []
+        Args:
+            repo_path: Repository root
+            max_shards: Maximum number of parallel Semgrep processes
+
+        Returns:
+            List of target lists, one per shard, or None if the repository is
+            too small (or a single process is requested) to benefit
+        """
+        if max_shards < 2 or not repo_path.is_dir():
+            return None
+
+        large_dirs: List[Path] = []
+        remainder: List[Path] = []
+        with os.scandir(repo_path) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                # Semgrep never scans git metadata; don't pass it as a target
+                if entry.name == ".git":
+                    continue
+                # Other hidden entries (.github, .venv, ...) are never sharded;
+                # Semgrep's own ignore rules decide what inside them is scanned
+                if (
+                    not entry.name.startswith(".")
+                    and entry.is_dir(follow_symlinks=False)
+                    and _has_min_files(entry.path, _SHARD_MIN_FILES)
+                ):
+                    large_dirs.append(Path(entry.path))
+                else:
+                    remainder.append(Path(entry.path))
+
+        if len(large_dirs) < 2:
+            return None
+
+        shards: List[List[Path]] = [[] for _ in range(min(len(large_dirs), max_shards))]
+        for index, directory in enumerate(large_dirs):
+            shards[index % len(shards)].append(directory)
+        if remainder:
+            # Root-level files and small directories ride along with the first shard
+            shards[0].extend(remainder)
+        return shards
 
     def _to_finding(self, semgrep_result: Dict[str, Any]) -> Dict[str, Any] | None:
         """Convert Semgrep result to standard finding format.
@@ -117,11 +601,13 @@ class SemgrepAnalyzer:
             start = semgrep_result.get("start", {})
             end = semgrep_result.get("end", {})
             extra = semgrep_result.get("extra", {})
+            # Looked up once; the message, remediation and why_relevant all read it
+            metadata = extra.get("metadata")
             
             # Extract message - prefer Semgrep's message, fallback to metadata description
             message = semgrep_result.get("message", "")
-            if not message and "metadata" in extra:
-                message = extra["metadata"].get("description", "")
+            if not message and metadata is not None:
+                message = metadata.get("description", "")
             if not message:
                 # Create readable message from rule ID
                 message = self._format_rule_name(check_id)
@@ -137,31 +623,29 @@ class SemgrepAnalyzer:
             else:
                 lines_str = f"L{start_line}-L{end_line}"
 
-            # Map Semgrep severity to standard severity
-            severity_map = {
-                "ERROR": "critical",
-                "WARNING": "high",
-                "INFO": "medium",
-            }
-            mapped_severity = severity_map.get(severity.upper(), "medium")
+            # Map Semgrep severity to standard severity; common spellings hit
+            # the table directly, anything else is upper-cased first
+            mapped_severity = _SEVERITY_MAP.get(severity)
+            if mapped_severity is None:
+                mapped_severity = _SEVERITY_MAP.get(severity.upper(), "medium")
 
             # Get code snippet (first 3 lines max)
             code_snippet = ""
-            if "lines" in extra:
-                lines = extra["lines"].split("\n")[:3]
-                code_snippet = "\n".join(lines).strip()
+            lines = extra.get("lines")
+            if lines is not None:
+                code_snippet = "\n".join(lines.split("\n", 3)[:3]).strip()
 
             # Extract remediation guidance
-            remediation = self._extract_remediation(extra, check_id)
+            remediation = self._extract_remediation(metadata, check_id)
             
             # Extract why_relevant from metadata
             why_relevant = ""
-            if "metadata" in extra:
-                why_relevant = extra["metadata"].get("cwe", "")
+            if metadata is not None:
+                why_relevant = metadata.get("cwe", "")
                 if why_relevant:
-                    why_relevant = f"CWE-{why_relevant}: {extra['metadata'].get('cwe_description', 'Security vulnerability detected')}"
+                    why_relevant = f"CWE-{why_relevant}: {metadata.get('cwe_description', 'Security vulnerability detected')}"
                 else:
-                    why_relevant = extra["metadata"].get("description", f"Semgrep rule {check_id} detected this security issue")
+                    why_relevant = metadata.get("description", f"Semgrep rule {check_id} detected this security issue")
             else:
                 why_relevant = f"Semgrep security rule detected: {check_id}"
 
@@ -217,20 +701,18 @@ class SemgrepAnalyzer:
             return f"{category}: {rule_name}"
         return rule_id.replace(".", " ").replace("-", " ").title()
 
-    def _extract_remediation(self, extra: Dict[str, Any], check_id: str) -> str:
+    def _extract_remediation(self, metadata: Dict[str, Any] | None, check_id: str) -> str:
         """Extract remediation guidance from Semgrep metadata.
         
         Args:
-            extra: Semgrep extra metadata
+            metadata: Semgrep rule metadata (extra.metadata), if any
             check_id: Rule ID
             
         Returns:
             Remediation guidance text
         """
         # Try to get remediation from metadata
-        if "metadata" in extra:
-            metadata = extra["metadata"]
-            
+        if metadata is not None:
             # Check for remediation field
             if "remediation" in metadata:
                 return metadata["remediation"]
@@ -240,17 +722,9 @@ class SemgrepAnalyzer:
                 return f"Follow OWASP guidelines: {metadata.get('owasp', '')}"
             
             # Generate based on rule type
-            if "deserialization" in check_id.lower() or "pickle" in check_id.lower():
-                return "Avoid using pickle for deserializing untrusted data. Use JSON or other safe serialization formats. If pickle is necessary, ensure data comes from trusted sources only."
-            
-            if "xss" in check_id.lower() or "jinja2" in check_id.lower():
-                return "Use Flask's auto-escaping or manually escape user input before rendering in templates. Never render user input directly without escaping."
-            
-            if "secrets" in check_id.lower() or "private-key" in check_id.lower():
-                return "Remove hardcoded secrets, API keys, or private keys from code. Use environment variables, secret management systems, or secure vaults. Rotate any exposed credentials immediately."
-            
-            if "injection" in check_id.lower():
-                return "Use parameterized queries or prepared statements. Never concatenate user input directly into queries or commands."
+            ranks = [_REMEDIATION_RANK[keyword.lower()] for keyword in _REMEDIATION_RE.findall(check_id)]
+            if ranks:
+                return _REMEDIATION_RULES[min(ranks)][1]
         
         # Default generic remediation
         return f"Review and fix the security issue identified by rule: {check_id}. Refer to security best practices for your language and framework."
@@ -1,14 +1,106 @@
 """Finding validator for security findings."""
 
+import functools
 import json
 import logging
+import re
 from pathlib import Path
-from typing import Any, Dict, List, Set
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
 
 import jsonschema
 
+try:
+    import jsonschema_rs
+    JSONSCHEMA_RS_AVAILABLE = True
+except ImportError:
+    JSONSCHEMA_RS_AVAILABLE = False
+
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Start line of an evidence range: "L100-L145" or "L50" (the "L" prefix is optional)
+_LINE_START_RE = re.compile(r"L?(\d+)(?:-|$)")
+
+# Raised by any validator backend; all carry a human-readable .message
+_VALIDATION_ERRORS: Tuple[type[Exception], ...] = (jsonschema.ValidationError,)
+if JSONSCHEMA_RS_AVAILABLE:
+    _VALIDATION_ERRORS += (jsonschema_rs.ValidationError,)
+if FASTJSONSCHEMA_AVAILABLE:
+    _VALIDATION_ERRORS += (fastjsonschema.JsonSchemaValueException,)
+
+
+# Sort rank per severity, pre-seeded with upper/title case spellings so the
+# common cases need no str.lower(); unknown severities sort with "info"
+_SEVERITY_ORDER = {
+    spelling: rank
+    for rank, level in enumerate(("critical", "high", "medium", "low", "info"))
+    for spelling in (level, level.upper(), level.title())
+}
+
+
+def _severity_sort_key(finding: Dict[str, Any]) -> Tuple[int, int]:
+    """Build the (severity rank, start line) sort key for a finding.
+
+    Args:
+        finding: Finding dictionary
+
+    Returns:
+        Tuple of severity rank and first evidence start line (0 if unknown)
+    """
+    severity = finding.get("severity", "info")
+    severity_score = _SEVERITY_ORDER.get(severity)
+    if severity_score is None:
+        severity_score = _SEVERITY_ORDER.get(severity.lower(), 4)
+
+    # Extract line number from evidence or finding
+    line_num = 0
+    evidence = finding.get("evidence", [])
+    if evidence:
+        lines_str = evidence[0].get("lines", "")
+        # Extract first number from "L100-L145" or "L50"
+        if lines_str:
+            match = _LINE_START_RE.match(str(lines_str).strip())
+            if match:
+                line_num = int(match.group(1))
+
+    return (severity_score, line_num)
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_schema(schema_path: str, mtime_ns: int) -> Tuple[Dict[str, Any], Callable[[Any], Any]]:
+    """Load a JSON schema and compile a validation function for it.
+
+    Cached per file and modification time, so every FindingValidator for an
+    unchanged schema shares one compiled validator. jsonschema-rs validates
+    in Rust; fastjsonschema generates specialized Python code for the
+    schema; jsonschema is the fallback.
+
+    Args:
+        schema_path: Path to JSON schema file
+        mtime_ns: Modification time of the file (part of the cache key)
+
+    Returns:
+        Tuple of (schema, validate function raising on invalid data)
+    """
+    schema = _loads(Path(schema_path).read_bytes())
+
+    if JSONSCHEMA_RS_AVAILABLE:
+        return schema, jsonschema_rs.validator_for(schema).validate
+    if FASTJSONSCHEMA_AVAILABLE:
+        return schema, fastjsonschema.compile(schema)
+    return schema, jsonschema.Draft7Validator(schema).validate
+
 
 class FindingValidator:
     """Validates security findings against JSON schema and de-duplicates."""
@@ -25,72 +117,81 @@ class FindingValidator:
             schema_path = package_root / "contracts" / "child_agent_schema.json"
 
         self.schema_path = schema_path
-        with open(schema_path, "r", encoding="utf-8") as f:
-            self.schema = json.load(f)
+        self.schema, self._validate = _compile_schema(
+            str(schema_path), Path(schema_path).stat().st_mtime_ns
+        )
 
-        self.validator = jsonschema.Draft7Validator(self.schema)
-
-    def validate_all(self, findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def validate_all(self, findings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Validate and de-duplicate findings.
 
         Args:
-            findings: List of finding dictionaries to validate
+            findings: Finding dictionaries to validate
 
         Returns:
             Validated, de-duplicated, sorted findings list
         """
-        valid_findings: List[Dict[str, Any]] = []
+        # Findings stream from validation straight into de-duplication
+        return self.merge(self.iter_valid(findings))
+
+    def iter_valid(self, findings: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield the findings that match the schema, logging the others.
+
+        Args:
+            findings: Finding dictionaries to validate
+
+        Yields:
+            Valid findings, in input order
+        """
+        validate = self._validate
 
         for finding in findings:
             try:
-                self.validator.validate(finding)
-                valid_findings.append(finding)
-            except jsonschema.ValidationError as e:
+                validate(finding)
+            except _VALIDATION_ERRORS as e:
                 logger.warning(
                     f"Skipped invalid finding: {e.message}. "
                     f"Finding: {finding.get('rule_id', 'unknown')}"
                 )
+                continue
+            yield finding
+
+    def merge(self, findings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """De-duplicate and sort already validated findings.
+
+        Args:
+            findings: Valid findings, earliest first
 
+        Returns:
+            De-duplicated findings sorted by severity, then line number
+        """
         # De-duplicate by (path, line, rule_id)
-        deduplicated = self._deduplicate(valid_findings)
+        deduplicated = self._deduplicate(findings)
 
         # Sort by severity (critical → info) then by line number
-        sorted_findings = self._sort_by_severity(deduplicated)
-
-        return sorted_findings
+        return self._sort_by_severity(deduplicated)
 
-    def _deduplicate(self, findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _deduplicate(self, findings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate findings based on path, line, and rule_id.
 
         Args:
-            findings: List of findings to de-duplicate
+            findings: Findings to de-duplicate
 
         Returns:
             De-duplicated list
         """
-        seen: Set[tuple[str, str, str]] = set()
-        unique_findings: List[Dict[str, Any]] = []
+        # Dicts keep insertion order, so the first finding per key wins
+        unique: Dict[Tuple[Any, Any, Any], Dict[str, Any]] = {}
+        keep_first = unique.setdefault
 
         for finding in findings:
-            # Extract evidence for path/line matching
-            evidence = finding.get("evidence", [])
-            if not evidence:
-                # If no evidence, use finding-level path if available
-                path = finding.get("path", "")
-                lines = finding.get("lines", "")
-            else:
-                # Use first evidence entry
-                path = evidence[0].get("path", "")
-                lines = evidence[0].get("lines", "")
-
-            rule_id = finding.get("rule_id", "")
-
-            key = (path, lines, rule_id)
-            if key not in seen:
-                seen.add(key)
-                unique_findings.append(finding)
-
-        return unique_findings
+            get = finding.get
+            # Use first evidence entry for path/line matching, or the
+            # finding-level path if there is no evidence
+            evidence = get("evidence")
+            location = evidence[0] if evidence else finding
+            keep_first((location.get("path", ""), location.get("lines", ""), get("rule_id", "")), finding)
+
+        return list(unique.values())
 
     def _sort_by_severity(self, findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Sort findings by severity, then by line number.
@@ -101,25 +202,6 @@ class FindingValidator:
         Returns:
             Sorted list
         """
-        severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3, "info": 4}
-
-        def sort_key(finding: Dict[str, Any]) -> tuple[int, int]:
-            severity = finding.get("severity", "info").lower()
-            severity_score = severity_order.get(severity, 4)
-
-            # Extract line number from evidence or finding
-            line_num = 0
-            evidence = finding.get("evidence", [])
-            if evidence:
-                lines_str = evidence[0].get("lines", "")
-                # Extract first number from "L100-L145" or "L50"
-                if lines_str:
-                    try:
-                        line_num = int(lines_str.replace("L", "").split("-")[0])
-                    except (ValueError, AttributeError):
-                        pass
-
-            return (severity_score, line_num)
-
-        return sorted(findings, key=sort_key)
-
+        # sorted() evaluates the key once per finding (decorate-sort-undecorate
+        # in C), so each line range is parsed once, not once per comparison
+        return sorted(findings, key=_severity_sort_key)
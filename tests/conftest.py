@@ -1,59 +1,85 @@
 """Pytest configuration and fixtures."""
 
+import copy
+import io
 import json
+import shutil
+import subprocess
 import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 
-@pytest.fixture
-def sample_finding() -> Dict:
-    """Sample valid finding dictionary."""
-    return {
-        "finding": "SQL injection vulnerability detected",
-        "evidence": [
-            {
-                "path": "src/app.py",
-                "lines": "L45-L47",
-                "why_relevant": "User input directly concatenated into SQL query",
-                "code_snippet": "query = f\"SELECT * FROM users WHERE id = {user_id}\"",
-            }
-        ],
-        "confidence": 0.9,
-        "tool": "semgrep",
-        "severity": "critical",
-        "rule_id": "python.sql-injection",
-        "remediation": "Use parameterized queries or ORM methods",
-    }
-
-
-@pytest.fixture
-def sample_findings(sample_finding: Dict) -> List[Dict]:
-    """List of sample findings."""
-    finding2 = {
-        **sample_finding,
-        "finding": "Hardcoded API key detected",
-        "evidence": [
-            {
-                "path": "config.py",
-                "lines": "L10",
-                "why_relevant": "API key hardcoded in source code",
-                "code_snippet": "API_KEY = 'NOT_A_REAL_SECRET'",
-            }
-        ],
-        "severity": "high",
-        "tool": "gitleaks",
-        "rule_id": "generic-api-key",
-    }
-    return [sample_finding, finding2]
-
-
-@pytest.fixture
-def temp_repo(tmp_path: Path) -> Path:
-    """Create a temporary repository for testing."""
-    repo = tmp_path / "test_repo"
+@pytest.fixture(autouse=True)
+def _no_sleep(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make time.sleep a no-op so retries or backoff never wait in unit tests.
+
+    Integration tests run real tools and keep real sleeps.
+    """
+    if request.node.get_closest_marker("integration") is None:
+        monkeypatch.setattr("time.sleep", lambda *args, **kwargs: None)
+
+
+# Built once at import; fixtures hand out read-only views or copies
+_SAMPLE_FINDING: Dict = {
+    "finding": "SQL injection vulnerability detected",
+    "evidence": [
+        {
+            "path": "src/app.py",
+            "lines": "L45-L47",
+            "why_relevant": "User input directly concatenated into SQL query",
+            "code_snippet": "query = f\"SELECT * FROM users WHERE id = {user_id}\"",
+        }
+    ],
+    "confidence": 0.9,
+    "tool": "semgrep",
+    "severity": "critical",
+    "rule_id": "python.sql-injection",
+    "remediation": "Use parameterized queries or ORM methods",
+}
+
+_SAMPLE_SECRET_FINDING: Dict = {
+    **_SAMPLE_FINDING,
+    "finding": "Hardcoded API key detected",
+    "evidence": [
+        {
+            "path": "config.py",
+            "lines": "L10",
+            "why_relevant": "API key hardcoded in source code",
+            "code_snippet": "API_KEY = 'NOT_A_REAL_SECRET'",
+        }
+    ],
+    "severity": "high",
+    "tool": "gitleaks",
+    "rule_id": "generic-api-key",
+}
+
+
+@pytest.fixture(scope="session")
+def sample_finding() -> Mapping:
+    """Sample valid finding, shared read-only across the session.
+
+    Build variants with ``dict(sample_finding) | {...}``; nested evidence is
+    shared too, so replace it rather than modifying it.
+    """
+    return MappingProxyType(_SAMPLE_FINDING)
+
+
+@pytest.fixture(scope="module")
+def sample_findings() -> Tuple[Dict, ...]:
+    """Sample findings, shared by a test module (a tuple: not to be modified)."""
+    return copy.deepcopy((_SAMPLE_FINDING, _SAMPLE_SECRET_FINDING))
+
+
+@pytest.fixture(scope="session")
+def _base_repo(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Build the sample repository once per session; copied by temp_repo."""
+    repo = tmp_path_factory.mktemp("base_repo") / "test_repo"
     repo.mkdir()
 
     # Create a Python file with vulnerability
@@ -73,22 +99,27 @@ SECRET = "password123"
 '''
     )
 
-    # Initialize git repo (optional, for gitleaks)
     return repo
 
 
 @pytest.fixture
+def temp_repo(_base_repo: Path, tmp_path: Path) -> Path:
+    """Create a temporary repository for testing (a private copy per test)."""
+    # Tests may modify the repository (e.g. git init), so each gets its own copy
+    return Path(shutil.copytree(_base_repo, tmp_path / "test_repo"))
+
+
+@pytest.fixture(scope="session")
 def schema_path() -> Path:
     """Path to JSON schema file bundled with the package."""
     project_root = Path(__file__).parent.parent / "src" / "proactive_security_orchestrator"
     return project_root / "contracts" / "child_agent_schema.json"
 
 
-@pytest.fixture
-def config_dir(tmp_path: Path) -> Path:
-    """Create temporary config directory."""
-    config = tmp_path / "config"
-    config.mkdir()
+@pytest.fixture(scope="session")
+def config_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create temporary config directory, shared by all tests (read-only)."""
+    config = tmp_path_factory.mktemp("config")
 
     # Create semgrep config
     semgrep_dir = config / "semgrep"
@@ -108,3 +139,82 @@ exclude:
 
     return config
 
+
+@pytest.fixture(scope="module")
+def finding_validator(schema_path: Path):
+    """FindingValidator shared by a test module (it holds no per-call state)."""
+    from proactive_security_orchestrator.validators.finding_validator import FindingValidator
+
+    return FindingValidator(schema_path=schema_path)
+
+
+@pytest.fixture(scope="module")
+def scanner(config_dir: Path):
+    """SecurityScanner shared by a test module; tests patch its child agents rather than mutating it."""
+    from proactive_security_orchestrator.security_orchestrator import SecurityScanner
+
+    return SecurityScanner(config_dir=config_dir)
+
+
+@pytest.fixture
+def mocked_scanner(scanner):
+    """Patch both child agents of the shared scanner in one call.
+
+    Usage: ``with mocked_scanner(semgrep_findings=[...]) as (scanner, semgrep, gitleaks):``
+    """
+
+    @contextmanager
+    def _ctx(
+        semgrep_findings: Optional[List[Dict]] = None,
+        gitleaks_findings: Optional[List[Dict]] = None,
+        semgrep_exc: Optional[BaseException] = None,
+    ) -> Iterator[Tuple]:
+        with patch.object(scanner.semgrep, "analyze") as semgrep, patch.object(
+            scanner.gitleaks, "scan"
+        ) as gitleaks:
+            if semgrep_exc is not None:
+                semgrep.side_effect = semgrep_exc
+            else:
+                semgrep.return_value = semgrep_findings or []
+            gitleaks.return_value = gitleaks_findings or []
+            yield scanner, semgrep, gitleaks
+
+    return _ctx
+
+
+@pytest.fixture
+def mock_run(monkeypatch: pytest.MonkeyPatch):
+    """Replace subprocess.run; call the returned function to set its result.
+
+    Calls return the replacement mock, e.g. ``run = mock_run(stdout=b"{}")``.
+    """
+    run = MagicMock()
+    monkeypatch.setattr("subprocess.run", run)
+
+    def _set(stdout: bytes = b"", returncode: int = 0, side_effect=None) -> MagicMock:
+        if side_effect is not None:
+            run.side_effect = side_effect
+        else:
+            run.return_value = subprocess.CompletedProcess([], returncode, stdout=stdout)
+        return run
+
+    return _set
+
+
+@pytest.fixture
+def mock_popen(monkeypatch: pytest.MonkeyPatch):
+    """Replace subprocess.Popen; call the returned function to set the process.
+
+    Calls return the replacement mock, e.g. ``popen = mock_popen(stdout=b"", returncode=1)``.
+    """
+    popen = MagicMock()
+    monkeypatch.setattr("subprocess.Popen", popen)
+
+    def _set(stdout: bytes = b"", returncode: int = 0, side_effect=None) -> MagicMock:
+        if side_effect is not None:
+            popen.side_effect = side_effect
+        else:
+            popen.return_value = MagicMock(returncode=returncode, stdout=io.BytesIO(stdout))
+        return popen
+
+    return _set
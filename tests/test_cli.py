@@ -1,17 +1,33 @@
 """Tests for CLI interface."""
 
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 from typer.testing import CliRunner
 
 from proactive_security_orchestrator import __version__
-from proactive_security_orchestrator.cli import app
+from proactive_security_orchestrator.cli import app, scan_command
 
 runner = CliRunner()
 
 
+@pytest.fixture(scope="module")
+def cli_repo(tmp_path_factory):
+    """Repository shared by the CLI tests (the mocked scans never write to it)."""
+    repo = tmp_path_factory.mktemp("cli_repo")
+    (repo / "test.py").touch()
+    return repo
+
+
+@pytest.fixture(autouse=True)
+def mock_scanner_cls():
+    """Patch SecurityScanner so no CLI test runs the real tools; scans find nothing by default."""
+    with patch("proactive_security_orchestrator.security_orchestrator.SecurityScanner") as scanner_cls:
+        scanner_cls.return_value.scan.return_value = []
+        yield scanner_cls
+
+
 def test_cli_help():
     """Test CLI help command."""
     result = runner.invoke(app, ["--help"])
@@ -28,61 +44,65 @@ def test_cli_version():
     assert f"v{__version__}" in result.stdout
 
 
-def test_cli_scan_invalid_format(tmp_path):
+def test_cli_scan_invalid_format(cli_repo, capsys):
     """Test CLI with invalid format."""
-    repo = tmp_path / "test_repo"
-    repo.mkdir()
-    (repo / "test.py").touch()
-
-    result = runner.invoke(app, ["scan", str(repo), "--format", "invalid"])
+    exit_code = scan_command(cli_repo, format="invalid")
 
-    assert result.exit_code != 0
-    assert "Invalid format" in result.stdout
+    assert exit_code != 0
+    assert "Invalid format" in capsys.readouterr().out
 
 
-def test_cli_scan_nonexistent_repo():
+def test_cli_scan_nonexistent_repo(capsys):
     """Test CLI with non-existent repository."""
-    result = runner.invoke(app, ["scan", "/nonexistent/repo"])
+    exit_code = scan_command("/nonexistent/repo")
 
-    assert result.exit_code != 0
-    assert "does not exist" in result.stdout
+    assert exit_code != 0
+    assert "does not exist" in capsys.readouterr().out
 
 
-@patch("proactive_security_orchestrator.cli.SecurityScanner")
-def test_cli_scan_success(mock_scanner_class, tmp_path):
+def test_cli_scan_success(cli_repo, tmp_path, capsys):
     """Test successful CLI scan."""
-    repo = tmp_path / "test_repo"
-    repo.mkdir()
-    (repo / "test.py").touch()
-
-    # Mock scanner
-    mock_scanner = MagicMock()
-    mock_scanner.scan.return_value = []  # No findings
-    mock_scanner_class.return_value = mock_scanner
-
     output_file = tmp_path / "findings.json"
-    result = runner.invoke(app, ["scan", str(repo), "--format", "json", "--output", str(output_file)])
+    exit_code = scan_command(cli_repo, format="json", output=output_file)
 
-    assert result.exit_code == 0
-    assert "No security findings" in result.stdout or "Found 0" in result.stdout
+    stdout = capsys.readouterr().out
+    assert exit_code == 0
+    assert "No security findings" in stdout or "Found 0" in stdout
     assert output_file.exists()
 
 
-@patch("proactive_security_orchestrator.cli.SecurityScanner")
-def test_cli_scan_with_findings(mock_scanner_class, tmp_path, sample_finding):
+def test_cli_scan_with_findings(mock_scanner_cls, cli_repo, tmp_path, sample_finding, capsys):
     """Test CLI scan with findings."""
-    repo = tmp_path / "test_repo"
-    repo.mkdir()
-
     # Mock scanner with findings
-    mock_scanner = MagicMock()
-    mock_scanner.scan.return_value = [sample_finding]
-    mock_scanner_class.return_value = mock_scanner
+    mock_scanner_cls.return_value.scan.return_value = [dict(sample_finding)]
 
     output_file = tmp_path / "findings.json"
-    result = runner.invoke(app, ["scan", str(repo), "--format", "json", "--output", str(output_file)])
+    exit_code = scan_command(cli_repo, format="json", output=output_file)
 
     # Should exit with non-zero if critical findings
+    assert exit_code == 1
     assert output_file.exists()
-    assert "findings" in result.stdout.lower()
+    assert "findings" in capsys.readouterr().out.lower()
+
+
+def test_cli_scan_invoke(mock_scanner_cls, cli_repo, tmp_path, sample_finding):
+    """Test the Typer command passes its options through to the scan."""
+    mock_scanner_cls.return_value.scan.return_value = [dict(sample_finding)]
+
+    output_file = tmp_path / "findings.sarif"
+    result = runner.invoke(
+        app,
+        [
+            "scan", str(cli_repo),
+            "--format", "sarif",
+            "--output", str(output_file),
+            "--timeout", "5",
+            "--base-ref", "origin/main",
+            "--no-fail-on-critical",
+        ],
+    )
 
+    assert result.exit_code == 0
+    assert output_file.exists()
+    mock_scanner_cls.assert_called_once_with(config_dir=Path("config"), timeout=5)
+    mock_scanner_cls.return_value.scan.assert_called_once_with(cli_repo, base_ref="origin/main")
@@ -5,21 +5,18 @@ import pytest
 from proactive_security_orchestrator.validators.finding_validator import FindingValidator
 
 
-def test_validate_valid_finding(sample_finding, schema_path):
+def test_validate_valid_finding(sample_finding, finding_validator):
     """Test validator accepts valid finding."""
-    validator = FindingValidator(schema_path=schema_path)
-    findings = [sample_finding]
+    finding = dict(sample_finding)
 
-    result = validator.validate_all(findings)
+    result = finding_validator.validate_all([finding])
 
     assert len(result) == 1
-    assert result[0] == sample_finding
+    assert result[0] == finding
 
 
-def test_validate_invalid_finding(schema_path):
+def test_validate_invalid_finding(finding_validator):
     """Test validator rejects finding missing required fields."""
-    validator = FindingValidator(schema_path=schema_path)
-
     # Missing required field
     invalid_finding = {
         "finding": "Test",
@@ -27,38 +24,94 @@ def test_validate_invalid_finding(schema_path):
     }
 
     findings = [invalid_finding]
-    result = validator.validate_all(findings)
+    result = finding_validator.validate_all(findings)
 
     assert len(result) == 0  # Invalid finding filtered out
 
 
-def test_deduplicate_findings(sample_finding, schema_path):
+def test_deduplicate_findings(sample_finding, finding_validator):
     """Test validator de-duplicates findings by path/line/rule_id."""
-    validator = FindingValidator(schema_path=schema_path)
-
     # Duplicate finding (same path, line, rule_id)
-    duplicate = {**sample_finding}
-    findings = [sample_finding, duplicate]
+    finding = dict(sample_finding)
+    duplicate = dict(sample_finding)
+    findings = [finding, duplicate]
 
-    result = validator.validate_all(findings)
+    result = finding_validator.validate_all(findings)
 
     assert len(result) == 1  # Duplicate removed
 
 
-def test_sort_by_severity(sample_finding, schema_path):
+def test_sort_by_severity(sample_finding, finding_validator):
     """Test validator sorts findings by severity."""
-    validator = FindingValidator(schema_path=schema_path)
-
     # Create findings with different severities
-    critical = {**sample_finding, "severity": "critical"}
-    high = {**sample_finding, "severity": "high", "rule_id": "rule2"}
-    medium = {**sample_finding, "severity": "medium", "rule_id": "rule3"}
+    critical = dict(sample_finding) | {"severity": "critical"}
+    high = dict(sample_finding) | {"severity": "high", "rule_id": "rule2"}
+    medium = dict(sample_finding) | {"severity": "medium", "rule_id": "rule3"}
 
     findings = [medium, critical, high]  # Wrong order
-    result = validator.validate_all(findings)
+    result = finding_validator.validate_all(findings)
 
     # Should be sorted: critical, high, medium
     assert result[0]["severity"] == "critical"
     assert result[1]["severity"] == "high"
     assert result[2]["severity"] == "medium"
 
+
+def test_compiled_schema_shared(schema_path):
+    """Test validators for the same unchanged schema share one compiled validator."""
+    assert FindingValidator(schema_path=schema_path)._validate is FindingValidator(schema_path=schema_path)._validate
+
+
+@pytest.mark.parametrize("backend", ["jsonschema_rs", "fastjsonschema", "jsonschema"])
+def test_validator_backends(sample_finding, schema_path, monkeypatch, backend):
+    """Test all validator backends accept and reject the same findings."""
+    from proactive_security_orchestrator.validators import finding_validator
+
+    if backend != "jsonschema":
+        pytest.importorskip(backend)
+    monkeypatch.setattr(finding_validator, "JSONSCHEMA_RS_AVAILABLE", backend == "jsonschema_rs")
+    monkeypatch.setattr(finding_validator, "FASTJSONSCHEMA_AVAILABLE", backend == "fastjsonschema")
+    finding_validator._compile_schema.cache_clear()
+    validator = FindingValidator(schema_path=schema_path)
+
+    invalid = [
+        dict(sample_finding) | {"confidence": 1.5},
+        dict(sample_finding) | {"severity": "urgent"},
+        dict(sample_finding) | {"evidence": []},
+        dict(sample_finding) | {"unexpected": True},
+    ]
+    finding = dict(sample_finding)
+    try:
+        assert validator.validate_all([finding, *invalid]) == [finding]
+    finally:
+        finding_validator._compile_schema.cache_clear()
+
+
+def test_deduplicate_keeps_first_occurrence(sample_finding, finding_validator):
+    """Test de-duplication keeps the first finding per (path, lines, rule_id), in order."""
+    other_line = dict(sample_finding) | {"evidence": [{**sample_finding["evidence"][0], "lines": "L99"}]}
+    duplicate = dict(sample_finding) | {"finding": "Same location reported again"}
+    no_evidence = {"rule_id": "r", "path": "a.py", "lines": "L1"}
+    finding = dict(sample_finding)
+
+    result = finding_validator._deduplicate([finding, other_line, duplicate, no_evidence, dict(no_evidence)])
+
+    assert result == [finding, other_line, no_evidence]
+    assert result[0] is finding
+
+
+def test_iter_valid_and_merge(sample_finding, finding_validator):
+    """Test per-tool validation followed by a merge matches validate_all."""
+    high = dict(sample_finding) | {"severity": "high", "rule_id": "python.eval"}
+    duplicate = dict(sample_finding) | {"tool": "gitleaks"}
+    invalid = dict(sample_finding) | {"confidence": 2.0}
+    finding = dict(sample_finding)
+
+    semgrep_valid = list(finding_validator.iter_valid([high, invalid, finding]))
+    gitleaks_valid = list(finding_validator.iter_valid([duplicate]))
+    assert semgrep_valid == [high, finding]
+
+    merged = finding_validator.merge([*semgrep_valid, *gitleaks_valid])
+    assert merged == [finding, high]
+    assert merged[0] is finding
+    assert merged == finding_validator.validate_all([high, invalid, finding, duplicate])
@@ -0,0 +1,67 @@
+"""Tests for the findings cache."""
+
+import hashlib
+from unittest.mock import patch
+
+import pytest
+
+from proactive_security_orchestrator.cache import findings_cache
+from proactive_security_orchestrator.cache.findings_cache import FindingsCache, hash_file, hash_files
+
+
+def test_hash_file(tmp_path):
+    """Test files are hashed by content."""
+    path = tmp_path / "app.py"
+    path.write_bytes(b"print('hi')\n")
+
+    with patch.object(findings_cache, "_FILE_DIGEST", "sha256"):
+        assert hash_file(path) == hashlib.sha256(b"print('hi')\n").hexdigest()
+
+
+def test_hash_file_blake3(tmp_path):
+    """Test BLAKE3 is used when installed."""
+    blake3 = pytest.importorskip("blake3")
+    path = tmp_path / "app.py"
+    path.write_bytes(b"print('hi')\n")
+
+    assert hash_file(path) == blake3.blake3(b"print('hi')\n").hexdigest()
+
+
+@pytest.mark.parametrize("threshold", [1, 1000])
+def test_hash_files(tmp_path, threshold):
+    """Test many files are hashed in order, skipping unreadable ones."""
+    paths = []
+    for index in range(5):
+        path = tmp_path / f"file{index}.py"
+        path.write_text(f"x = {index}\n")
+        paths.append(path)
+    paths.insert(2, tmp_path / "missing.py")
+
+    with patch.object(findings_cache, "_PARALLEL_HASH_THRESHOLD", threshold):
+        digests = hash_files(paths)
+
+    assert list(digests) == [path for path in paths if path.exists()]
+    assert all(digests[path] == hash_file(path) for path in digests)
+
+
+def test_cache_roundtrip(tmp_path, sample_finding):
+    """Test stored findings are returned for the same path, file and rules hashes only."""
+    cache_path = tmp_path / "cache" / "findings.sqlite"
+    finding = dict(sample_finding)
+
+    with FindingsCache(cache_path) as cache:
+        # Identical content at two paths keeps one entry per path
+        cache.put_many(
+            [("a.py", "hash-a", [finding]), ("a.txt", "hash-a", []), ("b.py", "hash-b", [])],
+            rules_hash="rules-1",
+        )
+
+    # Entries persist across connections
+    with FindingsCache(cache_path) as cache:
+        keys = [("a.py", "hash-a"), ("a.txt", "hash-a"), ("b.py", "hash-b"), ("c.py", "hash-a")]
+        assert cache.get_many(keys, "rules-1") == {
+            ("a.py", "hash-a"): [finding],
+            ("a.txt", "hash-a"): [],
+            ("b.py", "hash-b"): [],
+        }
+        assert cache.get_many([("a.py", "hash-a")], "rules-2") == {}
@@ -1,63 +1,60 @@
 """Tests for Gitleaks scanner."""
 
 import json
-from unittest.mock import MagicMock, patch
+import os
+from unittest.mock import patch
 
 import pytest
 
-from proactive_security_orchestrator.tools.gitleaks_scanner import GitleaksScanner
-
-
-def test_scan_success(config_dir):
+from proactive_security_orchestrator.tools.gitleaks_scanner import GitleaksScanner, _redact
+
+# Keep the scanner modules on one xdist worker so they share its session fixtures
+pytestmark = pytest.mark.xdist_group("scanner_fixtures")
+
+# Mock gitleaks output (one JSON object per line), serialized once at import
+_GITLEAKS_STDOUT = json.dumps(
+    {
+        "Description": "Generic API Key",
+        "StartLine": 10,
+        "EndLine": 10,
+        "StartColumn": 11,
+        "EndColumn": 40,
+        # Use obviously fake/non-sensitive values to avoid triggering scanners
+        "Match": "NOT_A_REAL_SECRET_KEY_FOR_TESTS",
+        "Secret": "NOT_A_REAL_SECRET_KEY_FOR_TESTS",
+        "File": "config.py",
+        "SymlinkFile": "",
+        "Commit": "",
+        "Entropy": 4.5,
+        "Author": "",
+        "Email": "",
+        "Date": "",
+        "Message": "",
+        "Tags": [],
+        "RuleID": "generic-api-key",
+    }
+).encode() + b"\n"
+
+
+def test_scan_success(config_dir, mock_popen):
     """Test successful Gitleaks scan."""
     scanner = GitleaksScanner(config_dir / "gitleaks")
 
-    # Mock gitleaks output (one JSON object per line)
-    gitleaks_output = json.dumps(
-        {
-            "Description": "Generic API Key",
-            "StartLine": 10,
-            "EndLine": 10,
-            "StartColumn": 11,
-            "EndColumn": 40,
-            # Use obviously fake/non-sensitive values to avoid triggering scanners
-            "Match": "NOT_A_REAL_SECRET_KEY_FOR_TESTS",
-            "Secret": "NOT_A_REAL_SECRET_KEY_FOR_TESTS",
-            "File": "config.py",
-            "SymlinkFile": "",
-            "Commit": "",
-            "Entropy": 4.5,
-            "Author": "",
-            "Email": "",
-            "Date": "",
-            "Message": "",
-            "Tags": [],
-            "RuleID": "generic-api-key",
-        }
-    )
-
-    with patch("subprocess.run") as mock_run:
-        mock_result = MagicMock()
-        mock_result.returncode = 1  # Gitleaks returns 1 when findings found
-        mock_result.stdout = gitleaks_output
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+    # Gitleaks returns 1 when findings found
+    mock_popen(stdout=_GITLEAKS_STDOUT, returncode=1)
 
-        findings = scanner.scan("/tmp/repo")
+    findings = scanner.scan("/tmp/repo")
 
-        assert len(findings) == 1
-        assert findings[0]["tool"] == "gitleaks"
-        assert findings[0]["severity"] == "critical"  # Secrets are always critical
-        assert findings[0]["rule_id"] == "generic-api-key"
+    assert len(findings) == 1
+    assert findings[0]["tool"] == "gitleaks"
+    assert findings[0]["severity"] == "critical"  # Secrets are always critical
+    assert findings[0]["rule_id"] == "generic-api-key"
 
 
-def test_redact_secrets(config_dir):
+def test_redact_secrets():
     """Test secret redaction in findings."""
-    scanner = GitleaksScanner(config_dir / "gitleaks")
-
-    # Test redaction method
     secret = "NOT_A_REAL_SECRET_KEY"
-    redacted = scanner._redact_secret(secret)
+    redacted = _redact(secret)
 
     assert redacted.startswith("NOT")
     assert redacted.endswith("KEY")
@@ -65,29 +62,77 @@ def test_redact_secrets(config_dir):
     assert secret not in redacted  # Full secret not in redacted version
 
 
-def test_scan_tool_not_found(config_dir):
-    """Test scanner handles missing gitleaks command."""
+def test_scan_base_ref_limits_commits(config_dir, mock_popen):
+    """Test base_ref restricts gitleaks to the commits since that ref."""
     scanner = GitleaksScanner(config_dir / "gitleaks")
 
-    with patch("subprocess.run") as mock_run:
-        mock_run.side_effect = FileNotFoundError("gitleaks: command not found")
+    popen = mock_popen()
 
-        findings = scanner.scan("/tmp/repo")
+    scanner.scan("/tmp/repo", base_ref="origin/main")
+
+    cmd = popen.call_args[0][0]
+    assert cmd[cmd.index("--log-opts") + 1] == "origin/main..HEAD"
+
+
+@pytest.mark.parametrize("base_ref", ["--no-merges", "main --all"])
+def test_scan_ignores_unsafe_base_ref(config_dir, mock_popen, base_ref):
+    """Test refs that would inject git log options fall back to a full history scan."""
+    scanner = GitleaksScanner(config_dir / "gitleaks")
+
+    popen = mock_popen()
+
+    scanner.scan("/tmp/repo", base_ref=base_ref)
+
+    assert "--log-opts" not in popen.call_args[0][0]
 
-        assert findings == []  # Empty list on error
 
+def test_scan_gitleaks_error(config_dir, mock_popen):
+    """Test scanner returns no findings when gitleaks exits with an error (exit code 2)."""
+    scanner = GitleaksScanner(config_dir / "gitleaks")
+
+    mock_popen(stdout=b'{"RuleID": "generic-api-key"}\n', returncode=2)
+
+    findings = scanner.scan("/tmp/repo")
+
+    assert findings == []
 
-def test_scan_no_findings(config_dir):
-    """Test scanner handles no findings (exit code 0)."""
+
+def test_scan_invalid_json(config_dir, caplog, mock_popen):
+    """Test scanner returns no findings when gitleaks output is not valid JSON."""
     scanner = GitleaksScanner(config_dir / "gitleaks")
 
-    with patch("subprocess.run") as mock_run:
-        mock_result = MagicMock()
-        mock_result.returncode = 0  # No findings
-        mock_result.stdout = ""
-        mock_run.return_value = mock_result
+    mock_popen(stdout=b'{"RuleID": "generic-api-key"\n', returncode=1)
+
+    findings = scanner.scan("/tmp/repo")
+
+    assert findings == []
+    assert "Failed to parse Gitleaks JSON output" in caplog.text
 
+
+def test_scan_timeout_kills_process(config_dir, tmp_path, caplog):
+    """Test scanner stops a gitleaks process that exceeds the timeout."""
+    scanner = GitleaksScanner(config_dir / "gitleaks", timeout=0.2)
+    slow_tool = tmp_path / "gitleaks"
+    slow_tool.write_text("#!/bin/sh\nexec sleep 5\n")
+    slow_tool.chmod(0o755)
+
+    with patch.dict("os.environ", {"PATH": f"{tmp_path}{os.pathsep}{os.environ['PATH']}"}):
         findings = scanner.scan("/tmp/repo")
 
-        assert findings == []  # Empty list when no findings
+    assert findings == []
+    assert "timed out" in caplog.text
+
+
+def test_scan_timeout_mid_line(config_dir, tmp_path, caplog):
+    """Test a timeout during a partially written line is reported as a timeout."""
+    scanner = GitleaksScanner(config_dir / "gitleaks", timeout=0.2)
+    slow_tool = tmp_path / "gitleaks"
+    slow_tool.write_text("#!/bin/sh\nprintf '{\"RuleID\": \"generic'\nexec sleep 5\n")
+    slow_tool.chmod(0o755)
+
+    with patch.dict("os.environ", {"PATH": f"{tmp_path}{os.pathsep}{os.environ['PATH']}"}):
+        findings = scanner.scan("/tmp/repo")
 
+    assert findings == []
+    assert "timed out" in caplog.text
+    assert "Failed to parse" not in caplog.text
@@ -28,27 +28,19 @@ def test_end_to_end_scan(temp_repo, config_dir):
 
 
 @pytest.mark.integration
-def test_integration_with_mocked_tools(temp_repo, config_dir, sample_findings):
+def test_integration_with_mocked_tools(temp_repo, mocked_scanner, sample_findings):
     """Test integration with mocked tools (simulates real scan)."""
-    from unittest.mock import patch
-
-    scanner = SecurityScanner(config_dir=config_dir)
-
     # Mock both tools to return sample findings
-    with patch.object(scanner.semgrep, "analyze") as mock_semgrep, patch.object(
-        scanner.gitleaks, "scan"
-    ) as mock_gitleaks:
-        mock_semgrep.return_value = [sample_findings[0]]
-        mock_gitleaks.return_value = [sample_findings[1]]
-
+    with mocked_scanner(
+        semgrep_findings=[sample_findings[0]], gitleaks_findings=[sample_findings[1]]
+    ) as (scanner, _, _):
         findings = scanner.scan(temp_repo)
 
-        # Should have both findings
-        assert len(findings) >= 2
-
-        # Should be validated
-        for finding in findings:
-            assert "tool" in finding
-            assert "severity" in finding
-            assert "evidence" in finding
+    # Should have both findings
+    assert len(findings) >= 2
 
+    # Should be validated
+    for finding in findings:
+        assert "tool" in finding
+        assert "severity" in finding
+        assert "evidence" in finding
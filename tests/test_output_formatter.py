@@ -1,30 +1,64 @@
 """Tests for output formatters."""
 
 import json
+import re
+import shutil
 
 import pytest
 
 from proactive_security_orchestrator.formatters.output_formatter import OutputFormatter
 
 
-def test_to_json(sample_findings):
-    """Test JSON formatter produces valid JSON."""
+@pytest.fixture(scope="module")
+def outputs(sample_findings):
+    """Rendered JSON, SARIF and HTML reports of sample_findings, built once per module."""
     formatter = OutputFormatter()
-    output = formatter.to_json(sample_findings)
+    return {
+        "json": formatter.to_json(sample_findings),
+        "sarif": formatter.to_sarif(sample_findings),
+        "html": formatter.to_html(sample_findings),
+    }
+
 
+def test_to_json(sample_findings, outputs):
+    """Test JSON formatter produces valid JSON."""
     # Should be valid JSON
-    parsed = json.loads(output)
+    parsed = json.loads(outputs["json"])
     assert isinstance(parsed, list)
     assert len(parsed) == len(sample_findings)
 
 
-def test_to_sarif(sample_findings):
-    """Test SARIF formatter produces valid SARIF."""
-    formatter = OutputFormatter()
-    output = formatter.to_sarif(sample_findings)
+@pytest.mark.parametrize("fmt", ["json", "sarif"])
+def test_stdlib_json_fallback(sample_findings, outputs, monkeypatch, tmp_path, fmt):
+    """Test JSON and SARIF output is identical with and without orjson."""
+    from proactive_security_orchestrator.formatters import output_formatter
+
+    pytest.importorskip("orjson")
+    monkeypatch.setattr(output_formatter, "ORJSON_AVAILABLE", False)
+    output_file = tmp_path / f"findings.{fmt}"
+
+    assert getattr(OutputFormatter, f"to_{fmt}")(sample_findings) == outputs[fmt]
+    OutputFormatter.save_to_file(sample_findings, fmt, output_file)
+    assert output_file.read_text(encoding="utf-8") == outputs[fmt]
 
+
+def test_count_severities_folds_unknown_into_info():
+    """Test severity counting normalizes case and counts unknown levels as info."""
+    from proactive_security_orchestrator.formatters import output_formatter
+
+    findings = [{"severity": "HIGH"}, {"severity": "bogus"}, {"severity": None}, {}, {"severity": "high"}]
+    severities = output_formatter._finding_severities(findings)
+    counts = output_formatter._count_severities(severities)
+
+    assert severities == ["high", "bogus", "info", "info", "high"]
+    assert counts == {"high": 2, "info": 3}
+    assert counts["critical"] == 0
+
+
+def test_to_sarif(outputs):
+    """Test SARIF formatter produces valid SARIF."""
     # Should be valid JSON
-    parsed = json.loads(output)
+    parsed = json.loads(outputs["sarif"])
 
     # Should have SARIF structure
     assert parsed["version"] == "2.1.0"
@@ -34,10 +68,9 @@ def test_to_sarif(sample_findings):
     assert "results" in parsed["runs"][0]
 
 
-def test_to_html(sample_findings):
+def test_to_html(sample_findings, outputs):
     """Test HTML formatter produces valid HTML."""
-    formatter = OutputFormatter()
-    output = formatter.to_html(sample_findings)
+    output = outputs["html"]
 
     # Should be HTML
     assert output.startswith("<!DOCTYPE html>")
@@ -45,6 +78,58 @@ def test_to_html(sample_findings):
     assert str(len(sample_findings)) in output  # Count should be in HTML
 
 
+def test_to_pdf(sample_findings):
+    """Test PDF formatter produces a PDF document (styles reused across calls)."""
+    pytest.importorskip("reportlab")
+
+    for findings in (sample_findings, []):
+        output = OutputFormatter.to_pdf(findings)
+        assert output.startswith(b"%PDF")
+
+
+def test_to_pdf_one_page_per_finding(sample_finding):
+    """Test PDF output keeps one page per finding, in order."""
+    pytest.importorskip("reportlab")
+    pypdf = pytest.importorskip("pypdf")
+    from io import BytesIO
+
+    findings = [dict(sample_finding) | {"finding": f"Issue number {i}"} for i in range(3)]
+
+    pages = pypdf.PdfReader(BytesIO(OutputFormatter.to_pdf(findings))).pages
+
+    assert len(pages) == len(findings)
+    for i, page in enumerate(pages):
+        assert f"Issue number {i}" in page.extract_text()
+
+
+def test_to_pdf_escapes_markup(sample_finding):
+    """Test PDF formatter renders finding text containing markup characters."""
+    pytest.importorskip("reportlab")
+
+    finding = dict(sample_finding) | {
+        "finding": "Unclosed <b> tag & friends",
+        "evidence": [{**sample_finding["evidence"][0], "code_snippet": "if a < b && c > d:"}],
+    }
+
+    output = OutputFormatter.to_pdf([finding])
+
+    assert output.startswith(b"%PDF")
+
+
+def test_to_html_escapes_finding_text(sample_finding):
+    """Test HTML formatter escapes untrusted finding fields."""
+    finding = dict(sample_finding) | {
+        "finding": "<script>alert('x')</script>",
+        "evidence": [{**sample_finding["evidence"][0], "code_snippet": "a < b && c > d"}],
+    }
+
+    output = OutputFormatter.to_html([finding])
+
+    assert "<script>" not in output
+    assert "&lt;script&gt;alert(&#x27;x&#x27;)&lt;/script&gt;" in output
+    assert "a &lt; b &amp;&amp; c &gt; d" in output
+
+
 def test_save_to_file(sample_findings, tmp_path):
     """Test saving findings to file."""
     formatter = OutputFormatter()
@@ -56,3 +141,56 @@ def test_save_to_file(sample_findings, tmp_path):
     content = json.loads(output_file.read_text())
     assert len(content) == len(sample_findings)
 
+
+def test_save_to_file_recreates_removed_dir(sample_findings, tmp_path):
+    """Test an output directory deleted after an earlier save is created again."""
+    output_file = tmp_path / "reports" / "findings.json"
+    OutputFormatter.save_to_file(sample_findings, "json", output_file)
+
+    shutil.rmtree(output_file.parent)
+    OutputFormatter.save_to_file(sample_findings, "json", output_file)
+
+    assert len(json.loads(output_file.read_text())) == len(sample_findings)
+
+
+@pytest.mark.parametrize("count", [0, 1, 2])
+def test_save_to_file_json_matches_to_json(sample_findings, tmp_path, count):
+    """Test streamed JSON file output is identical to to_json."""
+    findings = sample_findings[:count]
+    output_file = tmp_path / "findings.json"
+
+    OutputFormatter.save_to_file(findings, "json", output_file)
+
+    assert output_file.read_text(encoding="utf-8") == OutputFormatter.to_json(findings)
+
+
+def test_save_to_file_sarif_matches_to_sarif(sample_findings, outputs, tmp_path):
+    """Test SARIF file output is identical to to_sarif."""
+    output_file = tmp_path / "findings.sarif"
+
+    OutputFormatter.save_to_file(sample_findings, "sarif", output_file)
+
+    assert output_file.read_text(encoding="utf-8") == outputs["sarif"]
+
+
+def test_save_to_file_html_matches_to_html(sample_findings, outputs, tmp_path):
+    """Test streamed HTML file output matches to_html."""
+    output_file = tmp_path / "findings.html"
+
+    OutputFormatter.save_to_file(sample_findings, "html", output_file)
+
+    content = output_file.read_text(encoding="utf-8")
+    expected = outputs["html"]
+
+    # Only the generation timestamp may differ between the two renders
+    timestamp = re.compile(r"Generated: [^<]*")
+    assert timestamp.sub("", content) == timestamp.sub("", expected)
+
+
+def test_to_html_bytes(sample_findings, outputs):
+    """Test HTML bytes output is the UTF-8 encoding of to_html."""
+    output = OutputFormatter.to_html_bytes(sample_findings)
+
+    timestamp = re.compile(r"Generated: [^<]*")
+    expected = outputs["html"]
+    assert timestamp.sub("", output.decode("utf-8")) == timestamp.sub("", expected)
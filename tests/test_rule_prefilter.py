@@ -0,0 +1,119 @@
+"""Tests for the Semgrep literal prefilter."""
+
+import pytest
+
+from proactive_security_orchestrator.tools.rule_prefilter import (
+    LiteralMatcher,
+    _rule_literals,
+    build_literal_matcher,
+)
+
+pytest.importorskip("yaml")
+
+
+def test_rule_literals():
+    """Test literals are extracted from pattern, pattern-either and patterns rules."""
+    rules = [
+        {"id": "eval", "pattern": "eval($X)"},
+        {"id": "exec", "pattern-either": [{"pattern": "os.system($CMD)"}, {"pattern": "subprocess.call(..., shell=True)"}]},
+        {
+            "id": "pickle",
+            "patterns": [
+                {"pattern": "pickle.loads($DATA)"},
+                {"pattern-not": "pickle.loads(trusted)"},
+                {"metavariable-regex": {"metavariable": "$DATA", "regex": "req.*"}},
+            ],
+        },
+    ]
+
+    assert _rule_literals(rules) == {"eval", "system", "subprocess", "call", "shell", "true", "pickle", "loads"}
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        {"id": "p/python-security"},  # Registry reference
+        {"id": "regex", "pattern-regex": "AKIA[0-9A-Z]{16}"},
+        {"id": "metavars", "pattern": "$X == $X"},
+        {"id": "taint", "mode": "taint", "pattern-sources": [{"pattern": "request.args"}]},
+        {"id": "either", "pattern-either": [{"pattern": "eval($X)"}, {"pattern": "$F($X)"}]},
+        {"id": "regex-string", "pattern": 'login($X, "=~/^admin$/")'},
+        {"id": "string", "pattern": '$F("password")'},
+    ],
+)
+def test_rule_literals_unfilterable(rule):
+    """Test rules that could match without any literal disable the prefilter."""
+    assert _rule_literals([{"id": "eval", "pattern": "eval($X)"}, rule]) is None
+
+
+def test_regex_string_pattern_not_prefiltered():
+    """Test words inside a regex string literal never become literals (they need not occur)."""
+    rules = [{"id": "hardcoded-password", "pattern": '$F("=~/\\bpassw(or)?d/")'}]
+
+    assert _rule_literals(rules) is None
+
+
+def test_string_literal_contents_ignored():
+    """Test only code identifiers, not quoted string contents, become literals."""
+    rules = [{"id": "chmod", "pattern": 'os.system("chmod 0777 $PATH")'}, {"id": "md5", "pattern": "hashlib.new('md5sum')"}]
+
+    assert _rule_literals(rules) == {"system", "hashlib"}
+
+
+def test_literal_matcher_chunk_boundary(monkeypatch):
+    """Test the automaton finds literals spanning two chunks."""
+    pytest.importorskip("ahocorasick")
+    from proactive_security_orchestrator.tools import rule_prefilter
+
+    monkeypatch.setattr(rule_prefilter, "_AUTOMATON_CHUNK_SIZE", 8)
+    matcher = LiteralMatcher(["pickle"])
+
+    assert matcher.matches(b"x = 1; import PICKLE")
+    assert matcher.matches(b"abcdepickle")
+    assert not matcher.matches(b"pick" * 10)
+
+
+def test_literal_matcher_filter(tmp_path):
+    """Test only files containing a literal (case-insensitively) are kept."""
+    hit = tmp_path / "hit.py"
+    upper = tmp_path / "upper.php"
+    miss = tmp_path / "miss.py"
+    empty = tmp_path / "empty.py"
+    hit.write_text("result = eval(user_input)\n")
+    upper.write_text("<?php EVAL($code);\n")
+    miss.write_text("print('hello')\n")
+    empty.write_text("")
+
+    matcher = LiteralMatcher(["eval", "pickle"])
+
+    assert matcher.filter([hit, upper, miss, empty, tmp_path / "missing.py"]) == [
+        hit,
+        upper,
+        tmp_path / "missing.py",  # Unreadable files are left for Semgrep to report
+    ]
+
+
+def test_build_literal_matcher(tmp_path):
+    """Test matchers are only built for parsable rule files with literals."""
+    rules_path = tmp_path / "rules.yaml"
+    rules_path.write_text("rules:\n  - id: eval\n    pattern: eval($X)\n    languages: [python]\n")
+    assert build_literal_matcher(rules_path).literals == ["eval"]
+
+    rules_path.write_text("rules:\n  - id: p/python-security\n")
+    assert build_literal_matcher(rules_path) is None
+
+    rules_path.write_text("exclude:\n  - *.min.js\n")
+    assert build_literal_matcher(rules_path) is None
+    assert build_literal_matcher(tmp_path / "missing.yaml") is None
+
+
+def test_build_literal_matcher_cached(tmp_path):
+    """Test an unchanged rules file is parsed once and its matcher shared."""
+    rules_path = tmp_path / "rules.yaml"
+    rules_path.write_text("rules:\n  - id: eval\n    pattern: eval($X)\n    languages: [python]\n")
+
+    matcher = build_literal_matcher(rules_path)
+    assert build_literal_matcher(rules_path) is matcher
+
+    rules_path.write_text("rules:\n  - id: pickle\n    pattern: pickle.loads($X)\n    languages: [python]\n")
+    assert build_literal_matcher(rules_path).literals == ["loads", "pickle"]
@@ -0,0 +1,41 @@
+"""Error-handling tests shared by the Semgrep and Gitleaks child agents."""
+
+import pytest
+
+from proactive_security_orchestrator.tools.gitleaks_scanner import GitleaksScanner
+from proactive_security_orchestrator.tools.semgrep_analyzer import SemgrepAnalyzer
+
+
+@pytest.mark.parametrize(
+    "scanner_cls, method, config_subdir",
+    [
+        (SemgrepAnalyzer, "analyze", "semgrep"),
+        (GitleaksScanner, "scan", "gitleaks"),
+    ],
+    ids=["semgrep", "gitleaks"],
+)
+def test_tool_not_found(config_dir, mock_run, mock_popen, scanner_cls, method, config_subdir):
+    """Test scanners return no findings when the tool is not installed."""
+    scanner = scanner_cls(config_dir / config_subdir)
+    # Semgrep runs through subprocess.run, Gitleaks through subprocess.Popen
+    mock_run(side_effect=FileNotFoundError(f"{config_subdir}: command not found"))
+    mock_popen(side_effect=FileNotFoundError(f"{config_subdir}: command not found"))
+
+    assert getattr(scanner, method)("/tmp/repo") == []  # Empty list on error
+
+
+@pytest.mark.parametrize(
+    "scanner_cls, method, config_subdir, empty_output",
+    [
+        (SemgrepAnalyzer, "analyze", "semgrep", b'{"results": []}'),
+        (GitleaksScanner, "scan", "gitleaks", b""),
+    ],
+    ids=["semgrep", "gitleaks"],
+)
+def test_no_findings(config_dir, mock_run, mock_popen, scanner_cls, method, config_subdir, empty_output):
+    """Test scanners handle a clean run (exit code 0, nothing reported)."""
+    scanner = scanner_cls(config_dir / config_subdir)
+    mock_run(stdout=empty_output)
+    mock_popen(stdout=empty_output)
+
+    assert getattr(scanner, method)("/tmp/repo") == []
@@ -1,19 +1,25 @@
 """Tests for Semgrep analyzer."""
 
+import io
 import json
-from unittest.mock import MagicMock, patch
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from proactive_security_orchestrator.tools.semgrep_analyzer import SemgrepAnalyzer
+from proactive_security_orchestrator.tools.semgrep_analyzer import (
+    SemgrepAnalyzer,
+    _default_rules_config,
+)
 
+# Keep the scanner modules on one xdist worker so they share its session fixtures
+pytestmark = pytest.mark.xdist_group("scanner_fixtures")
 
-def test_analyze_success(config_dir):
-    """Test successful Semgrep analysis."""
-    analyzer = SemgrepAnalyzer(config_dir / "semgrep")
-
-    # Mock semgrep output
-    semgrep_output = {
+# Mock semgrep output, serialized once at import
+_SEMGREP_STDOUT = json.dumps(
+    {
         "results": [
             {
                 "check_id": "python.sql-injection",
@@ -25,59 +31,339 @@ def test_analyze_success(config_dir):
             }
         ]
     }
+).encode()
 
-    with patch("subprocess.run") as mock_run:
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = json.dumps(semgrep_output)
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
 
-        findings = analyzer.analyze("/tmp/repo")
+def test_analyze_success(config_dir, mock_run):
+    """Test successful Semgrep analysis."""
+    analyzer = SemgrepAnalyzer(config_dir / "semgrep")
+
+    mock_run(stdout=_SEMGREP_STDOUT)
 
-        assert len(findings) == 1
-        assert findings[0]["tool"] == "semgrep"
-        assert findings[0]["rule_id"] == "python.sql-injection"
-        assert findings[0]["severity"] == "critical"  # ERROR -> critical
+    findings = analyzer.analyze("/tmp/repo")
+
+    assert len(findings) == 1
+    assert findings[0]["tool"] == "semgrep"
+    assert findings[0]["rule_id"] == "python.sql-injection"
+    assert findings[0]["severity"] == "critical"  # ERROR -> critical
+
+
+def test_analyze_timeout(config_dir, mock_run):
+    """Test analyzer handles timeout."""
+    analyzer = SemgrepAnalyzer(config_dir / "semgrep", timeout=5)
 
+    mock_run(side_effect=subprocess.TimeoutExpired("semgrep", 5))
 
-def test_analyze_tool_not_found(config_dir):
-    """Test analyzer handles missing semgrep command."""
+    findings = analyzer.analyze("/tmp/repo")
+
+    assert findings == []  # Empty list on timeout
+
+
+def test_analyze_invalid_json(config_dir, mock_run):
+    """Test analyzer handles invalid JSON output."""
     analyzer = SemgrepAnalyzer(config_dir / "semgrep")
 
-    with patch("subprocess.run") as mock_run:
-        mock_run.side_effect = FileNotFoundError("semgrep: command not found")
+    mock_run(stdout=b"invalid json{")
 
-        findings = analyzer.analyze("/tmp/repo")
+    findings = analyzer.analyze("/tmp/repo")
 
-        assert findings == []  # Empty list on error
+    assert findings == []  # Empty list on parse error
 
 
-def test_analyze_timeout(config_dir):
-    """Test analyzer handles timeout."""
-    analyzer = SemgrepAnalyzer(config_dir / "semgrep", timeout=5)
+def test_analyze_error_exit_without_output(config_dir, caplog, mock_run):
+    """Test analyzer logs stderr and returns no findings when semgrep fails without output."""
+    analyzer = SemgrepAnalyzer(config_dir / "semgrep")
 
-    with patch("subprocess.run") as mock_run:
-        from subprocess import TimeoutExpired
+    def run_semgrep(cmd, stderr, **kwargs):
+        # stderr is redirected to a file, as a real process would write it
+        stderr.write("Invalid rule schema: ✗".encode() + b"x" * 1_000_000)
+        return subprocess.CompletedProcess(cmd, 2, stdout=b"\n")
 
-        mock_run.side_effect = TimeoutExpired("semgrep", 5)
+    mock_run(side_effect=run_semgrep)
 
-        findings = analyzer.analyze("/tmp/repo")
+    findings = analyzer.analyze("/tmp/repo")
 
-        assert findings == []  # Empty list on timeout
+    assert findings == []
+    assert "Invalid rule schema: ✗" in caplog.text
 
 
-def test_analyze_invalid_json(config_dir):
-    """Test analyzer handles invalid JSON output."""
+def test_shard_paths(tmp_path, monkeypatch):
+    """Test large top-level directories are split into shards."""
+    from proactive_security_orchestrator.tools import semgrep_analyzer
+
+    monkeypatch.setattr(semgrep_analyzer, "_SHARD_MIN_FILES", 2)
+    for name in ("api", "web"):
+        (tmp_path / name).mkdir()
+        for i in range(2):
+            (tmp_path / name / f"mod{i}.py").write_text("x = 1\n")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "index.md").write_text("# Docs\n")
+    (tmp_path / "setup.py").write_text("")
+    (tmp_path / ".git").mkdir()
+
+    shards = SemgrepAnalyzer._shard_paths(tmp_path, max_shards=4)
+
+    assert shards == [
+        [tmp_path / "api", tmp_path / "docs", tmp_path / "setup.py"],
+        [tmp_path / "web"],
+    ]
+    assert SemgrepAnalyzer._shard_paths(tmp_path, max_shards=1) is None
+    # A single large directory is not worth splitting
+    assert SemgrepAnalyzer._shard_paths(tmp_path / "api", max_shards=4) is None
+
+
+def test_analyze_merges_shards(config_dir, tmp_path, mock_run):
+    """Test sharded scans merge the results of every Semgrep process in shard order."""
     analyzer = SemgrepAnalyzer(config_dir / "semgrep")
+    shards = [[tmp_path / "api"], [tmp_path / "web"]]
+
+    def run_semgrep(cmd, **kwargs):
+        target = Path(cmd[-1]).name
+        stdout = json.dumps({
+            "results": [
+                {
+                    "check_id": f"python.{target}-rule",
+                    "path": f"{target}/app.py",
+                    "start": {"line": 1},
+                    "end": {"line": 1},
+                    "message": "Issue",
+                    "extra": {"severity": "WARNING"},
+                }
+            ]
+        }).encode()
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout)
+
+    run = mock_run(side_effect=run_semgrep)
+    with patch.object(SemgrepAnalyzer, "_shard_paths", return_value=shards):
+        findings = analyzer.analyze(tmp_path)
+
+    assert run.call_count == 2
+    assert [f["rule_id"] for f in findings] == ["python.api-rule", "python.web-rule"]
+
+
+def test_analyze_changed_files(config_dir, tmp_path, mock_run):
+    """Test incremental scans pass only the changed files to semgrep."""
+    analyzer = SemgrepAnalyzer(config_dir / "semgrep")
+    changed = [tmp_path / "app.py", tmp_path / "lib" / "util.py"]
+
+    run = mock_run(stdout=b'{"results": []}')
+
+    assert analyzer.analyze(tmp_path, changed_files=changed) == []
+    assert run.call_args[0][0][-2:] == [str(path) for path in changed]
+
+    # Nothing changed: semgrep is not run at all
+    run.reset_mock()
+    assert analyzer.analyze(tmp_path, changed_files=[]) == []
+    run.assert_not_called()
+
+
+def test_analyze_cached_skips_unchanged_files(config_dir, tmp_path, mock_run):
+    """Test cached scans only send files with new content to semgrep."""
+    analyzer = SemgrepAnalyzer(config_dir / "semgrep", cache_path=tmp_path / "cache.sqlite")
+    app = tmp_path / "app.py"
+    util = tmp_path / "util.py"
+    app.write_text("eval(input())\n")
+    util.write_text("x = 1\n")
+
+    def run_semgrep(cmd, **kwargs):
+        results = [
+            {
+                "check_id": "python.eval",
+                "path": target,
+                "start": {"line": 1},
+                "end": {"line": 1},
+                "message": "Eval",
+                "extra": {"severity": "ERROR"},
+            }
+            for target in cmd
+            if target.endswith("app.py")
+        ]
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps({"results": results}).encode())
+
+    run = mock_run(side_effect=run_semgrep)
+    first = analyzer.analyze(tmp_path, changed_files=[app, util])
+    second = analyzer.analyze(tmp_path, changed_files=[app, util])
+    assert run.call_count == 1
+
+    # Changing a file's content makes it a cache miss again
+    util.write_text("x = 2\n")
+    third = analyzer.analyze(tmp_path, changed_files=[app, util])
+
+    assert run.call_count == 2
+    assert run.call_args[0][0][-1] == str(util)
+    assert first == second == third
+    assert [f["evidence"][0]["path"] for f in first] == [str(app)]
 
-    with patch("subprocess.run") as mock_run:
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "invalid json{"
-        mock_run.return_value = mock_result
 
-        findings = analyzer.analyze("/tmp/repo")
+def test_analyze_cached_per_path(config_dir, tmp_path, mock_run):
+    """Test identical content at two paths is cached separately for each path."""
+    analyzer = SemgrepAnalyzer(config_dir / "semgrep", cache_path=tmp_path / "cache.sqlite")
+    app = tmp_path / "app.py"
+    notes = tmp_path / "app.txt"
+    app.write_text("eval(input())\n")
+    notes.write_text("eval(input())\n")
 
-        assert findings == []  # Empty list on parse error
+    def run_semgrep(cmd, **kwargs):
+        # Only the .py path matches the (Python) rule
+        results = [
+            {
+                "check_id": "python.eval",
+                "path": target,
+                "start": {"line": 1},
+                "end": {"line": 1},
+                "message": "Eval",
+                "extra": {"severity": "ERROR"},
+            }
+            for target in cmd
+            if target.endswith("app.py")
+        ]
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps({"results": results}).encode())
+
+    run = mock_run(side_effect=run_semgrep)
+    first = analyzer.analyze(tmp_path, changed_files=[app, notes])
+    second = analyzer.analyze(tmp_path, changed_files=[app, notes])
+
+    assert run.call_count == 1
+    assert [f["evidence"][0]["path"] for f in first] == [str(app)]
+    assert first == second
+
+
+def test_rules_cache_key(config_dir, tmp_path, monkeypatch):
+    """Test the cache key changes with the Semgrep version and, for registry rules, over time."""
+    from proactive_security_orchestrator.tools import semgrep_analyzer
+
+    local = tmp_path / "semgrep"
+    local.mkdir()
+    (local / "rules.yaml").write_text("rules:\n  - id: eval\n    pattern: eval($X)\n    languages: [python]\n")
+    registry = SemgrepAnalyzer(config_dir / "semgrep")
+    analyzer = SemgrepAnalyzer(local)
+
+    monkeypatch.setattr(semgrep_analyzer, "_semgrep_version", lambda: "1.43.1")
+    monkeypatch.setattr(semgrep_analyzer.time, "time", lambda: 0.0)
+    local_key, registry_key = analyzer._rules_cache_key(), registry._rules_cache_key()
+
+    monkeypatch.setattr(semgrep_analyzer.time, "time", lambda: 2.0 * semgrep_analyzer._REGISTRY_CACHE_MAX_AGE)
+    assert analyzer._rules_cache_key() == local_key
+    assert registry._rules_cache_key() != registry_key
+
+    monkeypatch.setattr(semgrep_analyzer, "_semgrep_version", lambda: "1.50.0")
+    assert analyzer._rules_cache_key() != local_key
+
+
+def test_analyze_cached_ignores_failed_runs(config_dir, tmp_path, mock_run):
+    """Test unusable semgrep output is not cached as 'no findings'."""
+    analyzer = SemgrepAnalyzer(config_dir / "semgrep", cache_path=tmp_path / "cache.sqlite")
+    app = tmp_path / "app.py"
+    app.write_text("eval(input())\n")
+
+    run = mock_run(stdout=b"invalid json{")
+
+    analyzer.analyze(tmp_path, changed_files=[app])
+    analyzer.analyze(tmp_path, changed_files=[app])
+
+    assert run.call_count == 2
+
+
+def test_analyze_prefilters_files(tmp_path, mock_run):
+    """Test files without any rule literal are not passed to semgrep."""
+    pytest.importorskip("yaml")
+    config = tmp_path / "semgrep"
+    config.mkdir()
+    (config / "rules.yaml").write_text("rules:\n  - id: eval\n    pattern: eval($X)\n    languages: [python]\n")
+    analyzer = SemgrepAnalyzer(config)
+    app = tmp_path / "app.py"
+    util = tmp_path / "util.py"
+    app.write_text("eval(input())\n")
+    util.write_text("x = 1\n")
+
+    run = mock_run(stdout=b'{"results": []}')
+
+    analyzer.analyze(tmp_path, changed_files=[app, util])
+    assert run.call_args[0][0][-1] == str(app)
+    assert str(util) not in run.call_args[0][0]
+
+    # No candidates left: semgrep is not run at all
+    run.reset_mock()
+    assert analyzer.analyze(tmp_path, changed_files=[util]) == []
+    run.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "semgrep_severity, expected",
+    [("ERROR", "critical"), ("error", "critical"), ("Warning", "high"), ("wArNiNg", "high"), ("INFO", "medium"), ("EXPERIMENT", "medium")],
+)
+def test_to_finding_severity_mapping(config_dir, semgrep_severity, expected):
+    """Test Semgrep severities map to standard severities regardless of case."""
+    analyzer = SemgrepAnalyzer(config_dir / "semgrep")
+    result = {
+        "check_id": "python.eval",
+        "path": "app.py",
+        "start": {"line": 1},
+        "end": {"line": 1},
+        "message": "Eval",
+        "extra": {"severity": semgrep_severity},
+    }
+
+    assert analyzer._to_finding(result)["severity"] == expected
+
+
+def test_default_rules_config(tmp_path):
+    """Test the default ruleset is downloaded once and reused while fresh."""
+    cache = tmp_path / "pso" / "auto.yml"
+
+    with patch("urllib.request.urlopen") as mock_urlopen:
+        mock_urlopen.return_value.__enter__.return_value = io.BytesIO(b"rules: []\n")
+
+        assert _default_rules_config(cache) == str(cache)
+        assert cache.read_bytes() == b"rules: []\n"
+        assert _default_rules_config(cache) == str(cache)
+        mock_urlopen.assert_called_once()
+
+
+def test_default_rules_config_download_fails(tmp_path):
+    """Test failed downloads fall back to a stale copy, then to the registry."""
+    cache = tmp_path / "pso" / "auto.yml"
+
+    with patch("urllib.request.urlopen", side_effect=OSError("offline")):
+        assert _default_rules_config(cache) == "p/default"
+        assert list(cache.parent.iterdir()) == []
+
+        cache.write_text("rules: []\n")
+        os.utime(cache, (0, 0))
+        assert _default_rules_config(cache) == str(cache)
+
+
+def test_analyze_without_rules_uses_cached_default(tmp_path, mock_run):
+    """Test semgrep runs offline against the cached default ruleset."""
+    analyzer = SemgrepAnalyzer(tmp_path / "missing")
+    run = mock_run(stdout=b'{"results": []}')
+
+    with patch(
+        "proactive_security_orchestrator.tools.semgrep_analyzer._default_rules_config",
+        return_value="/cache/auto.yml",
+    ) as mock_config:
+        analyzer.analyze(tmp_path)
+        analyzer.analyze(tmp_path)
+
+        cmd = run.call_args[0][0]
+        assert cmd[cmd.index("--config") + 1] == "/cache/auto.yml"
+        assert "--metrics=off" in cmd
+        assert "--disable-version-check" in cmd
+        mock_config.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "check_id, expected",
+    [
+        ("python.lang.security.deserialization.pickle.avoid-pickle", "Avoid using pickle"),
+        ("python.flask.XSS.direct-use-of-jinja2", "Use Flask's auto-escaping"),
+        ("generic.secrets.detected-private-key", "Remove hardcoded secrets"),
+        ("python.sql.injection.pickle-payload", "Avoid using pickle"),  # Earlier entries win
+        ("python.lang.maintainability.useless-eqeq", "Review and fix"),
+    ],
+)
+def test_extract_remediation(config_dir, check_id, expected):
+    """Test remediation guidance is chosen by rule ID keywords."""
+    analyzer = SemgrepAnalyzer(config_dir / "semgrep")
 
+    assert analyzer._extract_remediation({"cwe": "502"}, check_id).startswith(expected)